@@ -4,21 +4,60 @@ from datetime import timedelta
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_SCAN_INTERVAL, EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_USERNAME
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.typing import ConfigType
 
 from .const import (
+    ACCOUNT,
+    API,
+    CONF_APPLICATION,
+    CONF_FLEET,
+    CONF_HOURLY_BUDGET,
+    CONF_MAX_SCAN_INTERVAL,
     CONF_SERIAL_NUMBER,
+    CONF_SNAPSHOT_MODE,
+    CONF_SYSTEMS,
     COORDINATOR_LIST,
     COORDINATORS,
+    DEFAULT_HOURLY_BUDGET,
+    DEFAULT_MAX_SCAN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SNAPSHOT_MODE,
     DOMAIN,
     PLATFORMS,
+    QUICK_MODE,
+    READY,
     SERVICES_HANDLER,
+    SIGNAL_SYSTEM_READY,
+    SNAPSHOT,
+    SYSTEMS,
 )
-from .coordinator import MultimaticApi, MultimaticCoordinator
+from .account import (
+    Account,
+    account_id,
+    async_get_account,
+    async_release_account,
+)
+from .auth import SessionStore
+from .capabilities import (
+    absent_coordinators,
+    async_store_capabilities,
+    probe_capabilities,
+    stored_capabilities,
+)
+from .cache import SnapshotCache
+from .coordinator import (
+    MultimaticApi,
+    MultimaticCoordinator,
+    MultimaticSnapshotCoordinator,
+)
+from .fleet import async_list_fleet, fleet_system_id, system_phase
+from .interval import AdaptiveInterval
 from .service import SERVICES, MultimaticServiceHandler
+from .utils import system_ids
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,58 +69,190 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up multimatic from a config entry."""
-
-    api: MultimaticApi = MultimaticApi(hass, entry)
+    # The session is kept (not logged out) on stop, to be reused at next start
+    account = await async_get_account(
+        hass,
+        entry.data[CONF_USERNAME],
+        entry.data[CONF_PASSWORD],
+        entry.data[CONF_APPLICATION],
+        entry.entry_id,
+    )
+    account.set_budget(
+        entry.entry_id, entry.options.get(CONF_HOURLY_BUDGET, DEFAULT_HOURLY_BUDGET)
+    )
 
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN].setdefault(entry.entry_id, {})
-    hass.data[DOMAIN][entry.entry_id].setdefault(COORDINATORS, {})
+    hass.data[DOMAIN][entry.entry_id] = {ACCOUNT: account}
 
-    _LOGGER.debug(
-        "Setting up multimatic for serial  %s, id is %s",
-        entry.data.get(CONF_SERIAL_NUMBER),
-        entry.entry_id,
+    if entry.data.get(CONF_FLEET):
+        try:
+            systems = await async_list_fleet(hass, entry, account)
+        except ConfigEntryNotReady:
+            await async_release_account(hass, account, entry.entry_id)
+            hass.data[DOMAIN].pop(entry.entry_id)
+            raise
+        hass.data[DOMAIN][entry.entry_id][SYSTEMS] = [
+            fleet_system_id(entry.entry_id, serial) for serial in systems
+        ]
+        for serial in systems:
+            await async_setup_system(
+                hass, entry, account, fleet_system_id(entry.entry_id, serial), serial
+            )
+    else:
+        await async_setup_system(
+            hass, entry, account, entry.entry_id, entry.data.get(CONF_SERIAL_NUMBER)
+        )
+
+    for platform in PLATFORMS:
+        hass.async_create_task(
+            hass.config_entries.async_forward_entry_setup(entry, platform)
+        )
+
+    return True
+
+
+async def async_setup_system(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    account: Account,
+    system_id: str,
+    serial: str | None,
+) -> None:
+    """Set up the coordinators and services of a system.
+
+    An entry has a single system, except a fleet entry which has all the
+    systems of the account. Entities of a system are created once its data is
+    there, see `async_setup_systems`.
+    """
+    fleet = entry.data.get(CONF_FLEET, False)
+    api: MultimaticApi = MultimaticApi(hass, entry, account, system_id, serial)
+
+    hass.data[DOMAIN].setdefault(system_id, {})
+    hass.data[DOMAIN][system_id].setdefault(COORDINATORS, {})
+    hass.data[DOMAIN][system_id][ACCOUNT] = account
+    hass.data[DOMAIN][system_id][API] = api
+
+    _LOGGER.debug("Setting up multimatic for serial  %s, id is %s", serial, system_id)
+
+    scan_interval = timedelta(
+        minutes=entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    )
+    # Systems of a fleet are polled in a single cycle by the poller of the account
+    snapshot_mode = fleet or entry.options.get(
+        CONF_SNAPSHOT_MODE, DEFAULT_SNAPSHOT_MODE
+    )
+    cache = SnapshotCache(hass, system_id)
+
+    max_scan_interval = timedelta(
+        minutes=entry.options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)
     )
 
+    # Coordinators of features the system doesn't have are not created
+    capabilities = stored_capabilities(entry, serial)
+    absent = absent_coordinators(capabilities)
+
     for coord in COORDINATOR_LIST.items():
-        update_interval = (
-            coord[1]
-            if coord[1]
-            else timedelta(
-                minutes=entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-            )
+        if coord[0] in absent:
+            _LOGGER.debug("Skipping %s, system doesn't have it", coord[0])
+            continue
+        if snapshot_mode:
+            update_interval = None
+        else:
+            update_interval = coord[1] if coord[1] else scan_interval
+        # Endpoints polled at scan interval adapt to how often their data change
+        adaptive = (
+            None if coord[1] else AdaptiveInterval(scan_interval, max_scan_interval)
         )
         m_coord = MultimaticCoordinator(
             hass,
             name=f"{DOMAIN}_{coord[0]}",
             api=api,
-            method="get_" + coord[0],
+            key=coord[0],
             update_interval=update_interval,
+            cache=cache,
+            adaptive=adaptive,
+            # End of quick modes set elsewhere is only seen by polling
+            untracked_interval=scan_interval if coord[0] == QUICK_MODE else None,
         )
-        hass.data[DOMAIN][entry.entry_id][COORDINATORS][coord[0]] = m_coord
+        hass.data[DOMAIN][system_id][COORDINATORS][coord[0]] = m_coord
         _LOGGER.debug("Adding %s coordinator", m_coord.name)
-        await m_coord.async_refresh()
 
-    for platform in PLATFORMS:
-        hass.async_create_task(
-            hass.config_entries.async_forward_entry_setup(entry, platform)
+    coordinators = hass.data[DOMAIN][system_id][COORDINATORS]
+    snapshot = None
+    if snapshot_mode:
+        snapshot = MultimaticSnapshotCoordinator(
+            hass,
+            api,
+            coordinators,
+            COORDINATOR_LIST,
+            None if fleet else scan_interval,
         )
+        hass.data[DOMAIN][system_id][SNAPSHOT] = snapshot
 
-    async def logout(event):
-        await api.logout()
+    async def async_first_refresh():
+        if snapshot:
+            await snapshot.async_refresh()
+        else:
+            # Concurrency is bounded by the api, see MultimaticApi.fetch
+            await asyncio.gather(
+                *(m_coord.async_refresh() for m_coord in coordinators.values())
+            )
+        if capabilities is None:
+            probed = probe_capabilities(coordinators)
+            if probed is not None:
+                async_store_capabilities(hass, entry, probed, serial)
 
-    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, logout)
+    @callback
+    def async_ready():
+        hass.data[DOMAIN][system_id][READY] = True
+        async_dispatcher_send(
+            hass, SIGNAL_SYSTEM_READY.format(entry.entry_id), system_id
+        )
 
-    await async_setup_service(hass, api, entry)
+    cached = await cache.async_load()
+    if cached:
+        _LOGGER.debug("Creating entities from cached data, refreshing in background")
+        api.restore(cached)
+        for key, data in cached.items():
+            if key in coordinators:
+                coordinators[key].async_seed(data)
 
-    return True
+    if fleet:
+        # Systems of a fleet are polled one after the other, spread over the scan
+        # interval. Entities are created once data is there.
+        phase = system_phase(serial, scan_interval)
+        _LOGGER.debug("Starting %s in %s", serial, phase)
+        started = False
+
+        async def async_poll():
+            nonlocal started
+            if started:
+                await snapshot.async_refresh()
+                return
+            started = True
+            await async_first_refresh()
+            # Unloaded while refreshing, entities must not come back
+            if not cached and system_id in hass.data.get(DOMAIN, {}):
+                async_ready()
+
+        account.poller.async_add(system_id, scan_interval, phase, async_poll)
+        if cached:
+            async_ready()
+    elif cached:
+        hass.async_create_task(async_first_refresh())
+        async_ready()
+    else:
+        await async_first_refresh()
+        async_ready()
+
+    await async_setup_service(hass, api, system_id)
 
 
-async def async_setup_service(hass, api: MultimaticApi, entry: ConfigEntry):
+async def async_setup_service(hass, api: MultimaticApi, system_id: str):
     """Set up services."""
     serial = api.serial if api.fixed_serial else None
 
-    if not hass.data[DOMAIN][entry.entry_id].get(SERVICES_HANDLER):
+    if not hass.data[DOMAIN][system_id].get(SERVICES_HANDLER):
         service_handler = MultimaticServiceHandler(api, hass)
         for service_key, data in SERVICES.items():
             schema = data["schema"]
@@ -92,12 +263,12 @@ async def async_setup_service(hass, api: MultimaticApi, entry: ConfigEntry):
                 hass.services.async_register(
                     DOMAIN, key, getattr(service_handler, service_key), schema=schema
                 )
-        hass.data[DOMAIN][entry.entry_id][SERVICES_HANDLER] = service_handler
+        hass.data[DOMAIN][system_id][SERVICES_HANDLER] = service_handler
 
 
-async def async_unload_services(hass, entry: ConfigEntry):
+async def async_unload_services(hass, system_id: str):
     """Remove services when integration is removed."""
-    service_handler = hass.data[DOMAIN][entry.entry_id].get(SERVICES_HANDLER, None)
+    service_handler = hass.data[DOMAIN][system_id].get(SERVICES_HANDLER, None)
     if service_handler:
         serial = (
             service_handler.api.serial if service_handler.api.fixed_serial else None
@@ -110,6 +281,28 @@ async def async_unload_services(hass, entry: ConfigEntry):
                 hass.services.async_remove(DOMAIN, key)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data of a config entry."""
+    if entry.data.get(CONF_FLEET):
+        for serial in entry.data.get(CONF_SYSTEMS, {}):
+            await SnapshotCache(
+                hass, fleet_system_id(entry.entry_id, serial)
+            ).async_remove()
+    else:
+        await SnapshotCache(hass, entry.entry_id).async_remove()
+
+    username = entry.data[CONF_USERNAME]
+    application = entry.data[CONF_APPLICATION]
+    # Session is kept as long as another entry uses the account
+    if not any(
+        other.data[CONF_USERNAME] == username
+        and other.data[CONF_APPLICATION] == application
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if other.entry_id != entry.entry_id
+    ):
+        await SessionStore(hass, account_id(username, application)).async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = all(
@@ -121,9 +314,27 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
     )
     if unload_ok:
-        await async_unload_services(hass, entry)
-        hass.data[DOMAIN].pop(entry.entry_id)
+        account = hass.data[DOMAIN][entry.entry_id][ACCOUNT]
+        for system_id in system_ids(hass, entry.entry_id):
+            await async_unload_system(hass, system_id)
+        await async_release_account(hass, account, entry.entry_id)
+        # Data of a single system entry is already gone with its system
+        hass.data[DOMAIN].pop(entry.entry_id, None)
 
     _LOGGER.debug("Remaining data for multimatic %s", hass.data[DOMAIN])
 
     return unload_ok
+
+
+async def async_unload_system(hass: HomeAssistant, system_id: str) -> None:
+    """Stop polling a system and remove its services."""
+    data = hass.data[DOMAIN][system_id]
+    data[ACCOUNT].poller.async_remove(system_id)
+    await async_unload_services(hass, system_id)
+    snapshot = data.get(SNAPSHOT)
+    if snapshot:
+        snapshot.async_stop()
+    for coordinator in data[COORDINATORS].values():
+        coordinator.async_stop()
+    data[API].async_stop()
+    hass.data[DOMAIN].pop(system_id)
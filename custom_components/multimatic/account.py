@@ -0,0 +1,133 @@
+"""Connection to the API shared by the config entries of an account."""
+from __future__ import annotations
+
+import logging
+
+from pymultimatic.api import urls, urls_senso
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.util import slugify
+
+from .auth import AuthConnector, SessionStore
+from .breaker import ACCOUNT_THRESHOLD, CircuitBreaker
+from .budget import RequestBudget
+from .const import (
+    ACCOUNTS,
+    DEFAULT_ACCOUNT_CONCURRENCY,
+    DEFAULT_ENDPOINT_TIMEOUT,
+    DEFAULT_HOURLY_BUDGET,
+    SENSO,
+)
+from .poller import AccountPoller
+from .scheduler import request_timeout
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def account_id(username: str, application: str) -> str:
+    """Get the id of an account."""
+    return slugify(f"{username}_{application}")
+
+
+class Account:
+    """Session, connection pool and authentication of an account.
+
+    The API tolerates only one concurrent user per account, so all the config
+    entries (one per serial number) using the same account share them, as
+    well as the limit of concurrent requests.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, username: str, password: str, application: str
+    ) -> None:
+        """Init."""
+        self.id = account_id(username, application)
+        self.application = application
+        self.session = async_create_clientsession(hass)
+        self.budget = RequestBudget(DEFAULT_HOURLY_BUDGET)
+        self.connector = AuthConnector(
+            username, password, self.session, DEFAULT_ACCOUNT_CONCURRENCY, self.budget
+        )
+        self.connector.on_session_change = self._save_session
+        self.entries: set[str] = set()
+        self._budgets: dict[str, int] = {}
+        # Outages of the API are shared by all the entries of the account
+        self.breaker = CircuitBreaker(f"Account {self.id}", ACCOUNT_THRESHOLD)
+        self._store = SessionStore(hass, self.id)
+        # Systems of a fleet are polled from a single timer
+        self.poller = AccountPoller(hass)
+
+    async def async_restore_session(self) -> None:
+        """Reuse the stored session, login is skipped if it's still valid."""
+        if self.connector.restore_session(await self._store.async_load()):
+            _LOGGER.debug("Reusing stored session of %s", self.id)
+
+    async def async_list_systems(self) -> dict[str, str]:
+        """Get the systems of the account, serial number with name."""
+        account_urls = urls_senso if self.application == SENSO else urls
+        await self.connector.login()
+        with request_timeout(DEFAULT_ENDPOINT_TIMEOUT):
+            facilities = await self.connector.get(account_urls.facilities_list())
+        return {
+            facility["serialNumber"]: facility.get("name") or facility["serialNumber"]
+            for facility in facilities.get("body", {}).get("facilitiesList", [])
+        }
+
+    @callback
+    def set_budget(self, entry_id: str, hourly: int) -> None:
+        """Set the hourly budget configured by an entry, the lowest one applies."""
+        self._budgets[entry_id] = hourly
+        self._apply_budget()
+
+    @callback
+    def remove_budget(self, entry_id: str | None) -> None:
+        """Remove the hourly budget configured by an entry."""
+        self._budgets.pop(entry_id, None)
+        self._apply_budget()
+
+    @callback
+    def _apply_budget(self) -> None:
+        budgets = [hourly for hourly in self._budgets.values() if hourly]
+        self.budget.set_hourly(min(budgets, default=0))
+
+    @callback
+    def _save_session(self) -> None:
+        self._store.async_save(self.connector.export_session())
+
+
+async def async_get_account(
+    hass: HomeAssistant,
+    username: str,
+    password: str,
+    application: str,
+    entry_id: str | None = None,
+) -> Account:
+    """Get the account, creating it if needed, and register the entry using it."""
+    accounts: dict[str, Account] = hass.data.setdefault(ACCOUNTS, {})
+    account = accounts.get(account_id(username, application))
+    if account is None:
+        account = Account(hass, username, password, application)
+        accounts[account.id] = account
+        await account.async_restore_session()
+    else:
+        account.connector.update_password(password)
+
+    if entry_id:
+        account.entries.add(entry_id)
+    return account
+
+
+async def async_release_account(
+    hass: HomeAssistant, account: Account, entry_id: str | None = None
+) -> None:
+    """Unregister the entry, the account is closed when no entry uses it."""
+    account.entries.discard(entry_id)
+    account.remove_budget(entry_id)
+    if not account.entries:
+        _LOGGER.debug("Closing account %s", account.id)
+        account.poller.async_stop()
+        accounts: dict[str, Account] = hass.data.get(ACCOUNTS, {})
+        if accounts.get(account.id) is account:
+            del accounts[account.id]
+        await account.session.close()
@@ -0,0 +1,206 @@
+"""Authentication shared by all the calls to the API."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from aiohttp import ClientSession
+from pymultimatic.api import ApiError, urls
+from pymultimatic.api.connector import HEADER, Connector
+from yarl import URL
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .budget import RequestBudget
+from .const import DOMAIN as MULTIMATIC
+from .scheduler import (
+    PRIORITY_CONFIRM,
+    RequestScheduler,
+    current_priority,
+    current_timeout,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Sessions are renewed a bit before they are expected to expire
+RENEW_RATIO = 0.9
+MIN_SESSION_LIFETIME = timedelta(minutes=5)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 1
+
+
+class AuthConnector(Connector):
+    """Connector with a single flight authentication.
+
+    When the session expires, all the pending calls receive a 401. Only the
+    first one logs in again, the others wait for it and each failed call is
+    retried once. Once a session has been seen expiring, its lifetime is
+    known and next sessions are renewed a bit before they expire. Each
+    expiry updates the lifetime, it can grow as well as shrink.
+    """
+
+    def __init__(
+        self,
+        user: str,
+        password: str,
+        session: ClientSession,
+        max_requests: int,
+        budget: RequestBudget,
+    ) -> None:
+        """Init."""
+        super().__init__(user, password, session)
+        self.budget = budget
+        self._login_lock = asyncio.Lock()
+        self.scheduler = RequestScheduler(max_requests)
+        self._logged_at: datetime | None = None
+        self._lifetime: timedelta | None = None
+        self.generation = 0
+        self.on_session_change: Callable[[], None] | None = None
+
+    async def login(self, force: bool = False) -> bool:
+        """Log in, concurrent calls share the same authentication."""
+        return await self._login(force, self.generation)
+
+    async def logout(self) -> bool:
+        """Log out, next call will log in again."""
+        self._logged_at = None
+        try:
+            return await super().logout()
+        finally:
+            self._session_changed()
+
+    def update_password(self, password: str) -> None:
+        """Use a new password for next logins."""
+        self._password = password
+
+    def has_password(self, password: str) -> bool:
+        """Return whether the connector uses the given password."""
+        return self._password == password
+
+    def export_session(self) -> dict[str, Any] | None:
+        """Export the current session, so it can be restored later on."""
+        cookies = self._get_cookies()
+        if not self._logged_at or not cookies:
+            return None
+        return {
+            "cookies": {name: morsel.value for name, morsel in cookies.items()},
+            "logged_at": self._logged_at.isoformat(),
+            "lifetime": self._lifetime.total_seconds() if self._lifetime else None,
+        }
+
+    def restore_session(self, data: dict[str, Any]) -> bool:
+        """Restore an exported session, if it's still valid."""
+        cookies = data.get("cookies")
+        logged_at = dt_util.parse_datetime(data.get("logged_at", ""))
+        lifetime = timedelta(seconds=data["lifetime"]) if data.get("lifetime") else None
+        if not cookies or logged_at is None:
+            return False
+        if lifetime and dt_util.utcnow() - logged_at > lifetime * RENEW_RATIO:
+            _LOGGER.debug("Stored session has expired")
+            return False
+
+        self._session.cookie_jar.update_cookies(cookies, URL(urls.base()))
+        self._logged_at = logged_at
+        self._lifetime = lifetime
+        return True
+
+    async def request(
+        self, method: str, url: str, payload: dict[str, Any] | None = None
+    ) -> Any:
+        """Do a request, log in again and retry once on 401."""
+        await self._renew_if_needed()
+        generation = self.generation
+        status, data = await self._request(method, url, payload)
+        if status == 401:
+            if self._logged_at:
+                age = dt_util.utcnow() - self._logged_at
+                self._lifetime = max(age, MIN_SESSION_LIFETIME)
+            _LOGGER.debug("Request (%s) to %s failed, will re login", method, url)
+            await self._login(True, generation)
+            status, data = await self._request(method, url, payload)
+        if status > 399:
+            raise ApiError(
+                "Cannot " + method + " " + url,
+                response=data,
+                payload=payload,
+                status=status,
+            )
+        return data
+
+    async def _login(self, force: bool, generation: int) -> bool:
+        async with self._login_lock:
+            if generation != self.generation and self._get_cookies():
+                _LOGGER.debug("Already logged in by another call")
+                return True
+            if force or not self._get_cookies():
+                await super().login(True)
+                self._logged_at = dt_util.utcnow()
+                self.generation += 1
+                self._session_changed()
+            return True
+
+    def _session_changed(self) -> None:
+        if self.on_session_change:
+            self.on_session_change()
+
+    async def _renew_if_needed(self) -> None:
+        if (
+            self._logged_at
+            and self._lifetime
+            and dt_util.utcnow() - self._logged_at > self._lifetime * RENEW_RATIO
+        ):
+            _LOGGER.debug("Session is about to expire, will renew it")
+            await self._login(True, self.generation)
+
+    async def _request(
+        self, method: str, url: str, payload: dict[str, Any] | None
+    ) -> tuple[int, Any]:
+        priority = current_priority(method)
+        # Writes and their confirmation are done on behalf of the user
+        await self.budget.acquire(priority <= PRIORITY_CONFIRM)
+        async with self.scheduler.slot(priority):
+            # Waiting for the budget and a slot doesn't count in the timeout
+            return await asyncio.wait_for(
+                self._send(method, url, payload), current_timeout()
+            )
+
+    async def _send(
+        self, method: str, url: str, payload: dict[str, Any] | None
+    ) -> tuple[int, Any]:
+        _LOGGER.debug("Will call API: %s %s with payload %s", method, url, payload)
+        async with self._session.request(
+            method, url, json=payload, headers=HEADER
+        ) as resp:
+            if resp.status > 399:
+                # Error body is not always json
+                return resp.status, await resp.text()
+            return resp.status, await resp.json(content_type=None)
+
+
+class SessionStore:
+    """Store the session of an account, to reuse it after a restart."""
+
+    def __init__(self, hass: HomeAssistant, account_id: str) -> None:
+        """Init."""
+        self._store = Store(
+            hass, STORAGE_VERSION, f"{MULTIMATIC}.{account_id}.session"
+        )
+
+    async def async_load(self) -> dict[str, Any]:
+        """Load the stored session."""
+        return await self._store.async_load() or {}
+
+    @callback
+    def async_save(self, session: dict[str, Any] | None) -> None:
+        """Save the session, `None` forgets it."""
+        self._store.async_delay_save(lambda: session or {}, SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Remove the session from the storage."""
+        await self._store.async_remove()
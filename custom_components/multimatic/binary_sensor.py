@@ -13,7 +13,7 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -32,7 +32,7 @@ from .const import (
 )
 from .coordinator import MultimaticCoordinator
 from .entities import MultimaticEntity
-from .utils import get_coordinator
+from .utils import async_setup_systems, get_coordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,43 +41,48 @@ async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the multimatic binary sensor platform."""
-    sensors: list[MultimaticEntity] = []
 
-    dhw_coo = get_coordinator(hass, DHW, entry.entry_id)
-    if dhw_coo.data and dhw_coo.data.circulation:
-        sensors.append(CirculationSensor(dhw_coo))
-
-    hvac_coo = get_coordinator(hass, HVAC_STATUS, entry.entry_id)
-    detail_coo = get_coordinator(hass, FACILITY_DETAIL, entry.entry_id)
-    gw_coo = get_coordinator(hass, GATEWAY, entry.entry_id)
-    if hvac_coo.data:
-        sensors.append(BoxOnline(hvac_coo, detail_coo, gw_coo))
-        sensors.append(BoxUpdate(hvac_coo, detail_coo, gw_coo))
-        sensors.append(MultimaticErrors(hvac_coo))
-
-        if hvac_coo.data.boiler_status:
-            sensors.append(BoilerStatus(hvac_coo))
-
-    rooms_coo = get_coordinator(hass, ROOMS, entry.entry_id)
-    if rooms_coo.data:
-        for room in rooms_coo.data:
-            sensors.append(RoomWindow(rooms_coo, room))
-            for device in room.devices:
-                if device.device_type in ("VALVE", "THERMOSTAT"):
-                    sensors.append(RoomDeviceChildLock(rooms_coo, device, room))
-                sensors.append(RoomDeviceBattery(rooms_coo, device))
-                sensors.append(RoomDeviceConnectivity(rooms_coo, device))
+    @callback
+    def async_setup_system(system_id: str) -> None:
+        sensors: list[MultimaticEntity] = []
+
+        dhw_coo = get_coordinator(hass, DHW, system_id)
+        if dhw_coo and dhw_coo.data and dhw_coo.data.circulation:
+            sensors.append(CirculationSensor(dhw_coo))
+
+        hvac_coo = get_coordinator(hass, HVAC_STATUS, system_id)
+        detail_coo = get_coordinator(hass, FACILITY_DETAIL, system_id)
+        gw_coo = get_coordinator(hass, GATEWAY, system_id)
+        if hvac_coo.data:
+            sensors.append(BoxOnline(hvac_coo, detail_coo, gw_coo))
+            sensors.append(BoxUpdate(hvac_coo, detail_coo, gw_coo))
+            sensors.append(MultimaticErrors(hvac_coo))
+
+            if hvac_coo.data.boiler_status:
+                sensors.append(BoilerStatus(hvac_coo))
+
+        rooms_coo = get_coordinator(hass, ROOMS, system_id)
+        if rooms_coo and rooms_coo.data:
+            for room in rooms_coo.data:
+                sensors.append(RoomWindow(rooms_coo, room))
+                for device in room.devices:
+                    if device.device_type in ("VALVE", "THERMOSTAT"):
+                        sensors.append(RoomDeviceChildLock(rooms_coo, device, room))
+                    sensors.append(RoomDeviceBattery(rooms_coo, device))
+                    sensors.append(RoomDeviceConnectivity(rooms_coo, device))
+
+        sensors.extend(
+            [
+                HolidayModeSensor(get_coordinator(hass, HOLIDAY_MODE, system_id)),
+                QuickModeSensor(get_coordinator(hass, QUICK_MODE, system_id)),
+            ]
+        )
 
-    sensors.extend(
-        [
-            HolidayModeSensor(get_coordinator(hass, HOLIDAY_MODE, entry.entry_id)),
-            QuickModeSensor(get_coordinator(hass, QUICK_MODE, entry.entry_id)),
-        ]
-    )
+        _LOGGER.info("Adding %s binary sensor entities", len(sensors))
 
-    _LOGGER.info("Adding %s binary sensor entities", len(sensors))
+        async_add_entities(sensors)
 
-    async_add_entities(sensors)
+    async_setup_systems(hass, entry, async_setup_system)
 
 
 class CirculationSensor(MultimaticEntity, BinarySensorEntity):
@@ -86,6 +91,7 @@ class CirculationSensor(MultimaticEntity, BinarySensorEntity):
     def __init__(self, coordinator: MultimaticCoordinator) -> None:
         """Initialize entity."""
         super().__init__(coordinator, DOMAIN, "dhw_circulation")
+        self._circulation_id = coordinator.data.circulation.id
 
     @property
     def is_on(self) -> bool:
@@ -105,6 +111,11 @@ class CirculationSensor(MultimaticEntity, BinarySensorEntity):
             and self.coordinator.data.circulation
         )
 
+    @property
+    def data_key(self) -> str:
+        """Return the key of the data the entity relies on."""
+        return self._circulation_id
+
     @property
     def active_mode(self):
         """Return the active mode of the circulation."""
@@ -156,10 +167,15 @@ class RoomWindow(MultimaticEntity, BinarySensorEntity):
         """Return the name of the entity."""
         return self.room.name if self.room else None
 
+    @property
+    def data_key(self) -> str:
+        """Return the key of the data the entity relies on."""
+        return self._room_id
+
     @property
     def room(self) -> Room:
         """Return the room."""
-        return self.coordinator.find_component(self._room_id)
+        return self.coordinator.find_component(Room, self._room_id)
 
     @property
     def entity_category(self) -> EntityCategory | None:
@@ -195,6 +211,7 @@ class RoomDeviceEntity(MultimaticEntity, BinarySensorEntity):
         """Return the state attributes."""
         device = self.device
         return {
+            **super().extra_state_attributes,
             "device_id": device.sgtin,
             "battery_low": device.battery_low,
             "connected": not device.radio_out_of_reach,
@@ -205,14 +222,16 @@ class RoomDeviceEntity(MultimaticEntity, BinarySensorEntity):
         """Return True if entity is available."""
         return super().available and self.device
 
+    @property
+    def data_key(self) -> str | None:
+        """Return the id of the room the device belongs to."""
+        room = self.coordinator.index.device_rooms.get(self._sgtin)
+        return room.id if room else None
+
     @property
     def device(self):
         """Return the device."""
-        for room in self.coordinator.data:
-            for device in room.devices:
-                if device.sgtin == self._sgtin:
-                    return device
-        return None
+        return self.coordinator.index.devices.get(self._sgtin)
 
     @property
     def name(self) -> str | None:
@@ -247,7 +266,7 @@ class RoomDeviceChildLock(RoomDeviceEntity):
     @property
     def room(self) -> Room:
         """Return the room."""
-        return self.coordinator.find_component(self._room_id)
+        return self.coordinator.find_component(Room, self._room_id)
 
     @property
     def device_class(self) -> BinarySensorDeviceClass | None:
@@ -452,7 +471,11 @@ class BoilerStatus(MultimaticEntity, BinarySensorEntity):
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """Return the state attributes."""
         if self.available:
-            return {"device_id": self._boiler_id, "error": self.boiler_status.is_error}
+            return {
+                **super().extra_state_attributes,
+                "device_id": self._boiler_id,
+                "error": self.boiler_status.is_error,
+            }
         return None
 
     @property
@@ -0,0 +1,111 @@
+"""Circuit breaker protecting the API during outages."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+import logging
+import random
+from typing import Any
+
+from aiohttp import ClientError
+from pymultimatic.api import ApiError
+
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+BACKOFF_BASE = timedelta(seconds=30)
+BACKOFF_MAX = timedelta(minutes=30)
+# Endpoints fail alone (e.g. a missing feature), the account fails for all of them
+ENDPOINT_THRESHOLD = 3
+ACCOUNT_THRESHOLD = 5
+# A probe which doesn't complete (cancelled) doesn't hold the breaker forever
+PROBE_TIMEOUT = timedelta(minutes=2)
+
+
+def is_transient(err: BaseException) -> bool:
+    """Return whether the error is an outage or a throttling of the API."""
+    if isinstance(err, ApiError):
+        return err.status is None or err.status >= 500 or err.status == 429
+    return isinstance(err, (asyncio.TimeoutError, ClientError))
+
+
+class CircuitBreaker:
+    """Stop calling the API after consecutive transient failures.
+
+    Once `threshold` failures in a row are reached, the breaker opens and calls
+    are refused for a jittered, exponentially growing delay. After the delay,
+    a single probe call is let through (half open): its success closes the
+    breaker, its failure opens it again for a longer delay.
+    """
+
+    def __init__(self, name: str, threshold: int) -> None:
+        """Init."""
+        self.name = name
+        self.threshold = threshold
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.retry_at: datetime | None = None
+        self.last_error: str | None = None
+
+    @property
+    def blocked(self) -> bool:
+        """Return whether the next call would be refused."""
+        if self.state == STATE_CLOSED:
+            return False
+        return self.retry_at is not None and dt_util.utcnow() < self.retry_at
+
+    def allow(self) -> bool:
+        """Return whether a call can be done, the first call after the delay is the probe."""
+        if self.blocked:
+            return False
+        if self.state != STATE_CLOSED:
+            _LOGGER.debug("Probing %s", self.name)
+            self.state = STATE_HALF_OPEN
+            self.retry_at = dt_util.utcnow() + PROBE_TIMEOUT
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("%s is reachable again", self.name)
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.retry_at = None
+        self.last_error = None
+
+    def record_failure(self, err: BaseException) -> None:
+        """Count a transient failure, opening the breaker if needed."""
+        self.failures += 1
+        self.last_error = repr(err)
+        if self.state == STATE_HALF_OPEN or self.failures >= self.threshold:
+            self._open()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the breaker, for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_at": self.retry_at.isoformat() if self.retry_at else None,
+            "last_error": self.last_error,
+        }
+
+    def _open(self) -> None:
+        delay = min(BACKOFF_BASE * 2 ** min(self.opened, 10), BACKOFF_MAX)
+        # Equal jitter, so breakers of several systems don't probe all together
+        delay = delay / 2 + delay / 2 * random.random()
+        self.opened += 1
+        self.state = STATE_OPEN
+        self.retry_at = dt_util.utcnow() + delay
+        _LOGGER.warning(
+            "%s is failing (%s), next try at %s",
+            self.name,
+            self.last_error,
+            self.retry_at,
+        )
@@ -0,0 +1,89 @@
+"""Budget of requests sent to the API."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+# The bucket holds up to 15 minutes of budget, to absorb startups and writes
+BURST_RATIO = 0.25
+MIN_BURST = 20
+# Part of the bucket only available to writes
+WRITE_RESERVE = 0.2
+# Polling slows down below this part of the bucket, up to MAX_STRETCH times
+LOW_LEVEL = 0.5
+MAX_STRETCH = 4
+
+
+class RequestBudget:
+    """Token bucket limiting the requests of an account to an hourly budget.
+
+    Tokens are refilled continuously. Polls can't use the reserve kept at the
+    bottom of the bucket, so writes requested by the user go through even when
+    polling has consumed most of the budget.
+    """
+
+    def __init__(self, hourly: int) -> None:
+        """Init."""
+        self._lock = asyncio.Lock()
+        self.hourly = 0
+        self.capacity = 0.0
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+        self.set_hourly(hourly)
+
+    def set_hourly(self, hourly: int) -> None:
+        """Change the hourly budget, `0` means unlimited."""
+        if hourly == self.hourly:
+            return
+        self.hourly = hourly
+        self.capacity = max(hourly * BURST_RATIO, MIN_BURST) if hourly else 0.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def level(self) -> float:
+        """Return the available part of the bucket, between 0 and 1."""
+        if not self.hourly:
+            return 1.0
+        self._refill()
+        return self._tokens / self.capacity
+
+    @property
+    def poll_stretch(self) -> float:
+        """Return the factor to apply to polling intervals."""
+        level = self.level
+        if level >= LOW_LEVEL:
+            return 1.0
+        return LOW_LEVEL / max(level, LOW_LEVEL / MAX_STRETCH)
+
+    async def acquire(self, write: bool) -> None:
+        """Take a token, waiting for it if needed."""
+        if not self.hourly:
+            return
+        floor = 0.0 if write else self.capacity * WRITE_RESERVE
+        # Writes don't queue behind polls waiting for tokens
+        if write:
+            await self._take(floor)
+            return
+        async with self._lock:
+            await self._take(floor)
+
+    async def _take(self, floor: float) -> None:
+        while True:
+            self._refill()
+            if self._tokens - floor >= 1:
+                self._tokens -= 1
+                return
+            wait = (floor + 1 - self._tokens) * 3600 / self.hourly
+            _LOGGER.debug("Request budget is exhausted, waiting %.0fs", wait)
+            await asyncio.sleep(wait)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.hourly / 3600
+        )
+        self._updated = now
@@ -0,0 +1,59 @@
+"""Persistent cache of the last good data of a config entry."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN as MULTIMATIC
+from .utils import model_from_json, model_to_json
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+
+class SnapshotCache:
+    """Store the last data received for each coordinator key.
+
+    It allows to create entities right away at startup, without waiting for
+    the API.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Init."""
+        self._store = Store(hass, STORAGE_VERSION, f"{MULTIMATIC}.{entry_id}.snapshot")
+        self._data: dict[str, Any] = {}
+
+    async def async_load(self) -> dict[str, Any]:
+        """Load cached data, keyed by coordinator key."""
+        raw = await self._store.async_load()
+        if not raw:
+            return {}
+        try:
+            self._data = {
+                key: model_from_json(value) for key, value in raw["data"].items()
+            }
+        except (KeyError, TypeError, ValueError):
+            _LOGGER.warning("Cannot read cached data, ignoring it", exc_info=True)
+            self._data = {}
+        return dict(self._data)
+
+    @callback
+    def async_update(self, key: str, data: Any) -> None:
+        """Update data of a key, it will be saved later on."""
+        self._data[key] = data
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Remove the cache from the storage."""
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "data": {key: model_to_json(value) for key, value in self._data.items()}
+        }
@@ -0,0 +1,138 @@
+"""Features of the systems, probed once and stored in the config entry."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import timedelta
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_CAPABILITIES,
+    CONF_FLEET,
+    DHW,
+    EMF_REPORTS,
+    ROOMS,
+    VENTILATION,
+    ZONES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+HAS_VENTILATION = "has_ventilation"
+HAS_ROOMS = "has_rooms"
+HAS_EMF = "has_emf"
+HAS_COOLING = "has_cooling"
+HAS_DHW_TANK = "has_dhw_tank"
+PROBED_AT = "probed_at"
+
+# Features can be added to the system, they are probed again from time to time
+PROBE_INTERVAL = timedelta(days=7)
+
+# Coordinators which are not created when the feature is absent
+CAPABILITY_COORDINATORS = {
+    HAS_VENTILATION: VENTILATION,
+    HAS_ROOMS: ROOMS,
+    HAS_EMF: EMF_REPORTS,
+}
+
+
+def entry_capabilities(
+    entry: ConfigEntry, serial: str | None = None
+) -> Mapping[str, Any]:
+    """Get the capabilities of a system of the entry, whatever their age.
+
+    A fleet entry keeps the capabilities of each system by serial number.
+    """
+    capabilities = entry.data.get(CONF_CAPABILITIES) or {}
+    if entry.data.get(CONF_FLEET):
+        return capabilities.get(serial) or {}
+    return capabilities
+
+
+def stored_capabilities(
+    entry: ConfigEntry, serial: str | None = None
+) -> Mapping[str, Any] | None:
+    """Get the capabilities of a system of the entry, `None` if they must be probed."""
+    capabilities = entry_capabilities(entry, serial)
+    if not capabilities:
+        return None
+    probed_at = dt_util.parse_datetime(capabilities.get(PROBED_AT, ""))
+    if probed_at is None or dt_util.utcnow() - probed_at > PROBE_INTERVAL:
+        return None
+    return capabilities
+
+
+def absent_coordinators(capabilities: Mapping[str, Any] | None) -> set[str]:
+    """Get the coordinator keys of the features the system doesn't have."""
+    if not capabilities:
+        return set()
+    return {
+        key
+        for capability, key in CAPABILITY_COORDINATORS.items()
+        if capabilities.get(capability) is False
+    }
+
+
+def probe_capabilities(coordinators: Mapping[str, Any]) -> dict[str, bool] | None:
+    """Get the capabilities from the data of the first refresh.
+
+    `None` is returned if a coordinator couldn't get its data, an absent feature
+    answers with no data (or a 400/409, see `_first_fetch_data`).
+    """
+    data = {}
+    for key in (VENTILATION, ROOMS, EMF_REPORTS, ZONES, DHW):
+        coordinator = coordinators.get(key)
+        if (
+            coordinator is None
+            or not coordinator.last_update_success
+            or coordinator.stale
+        ):
+            return None
+        data[key] = coordinator.data
+
+    dhw = data[DHW]
+    return {
+        HAS_VENTILATION: data[VENTILATION] is not None,
+        HAS_ROOMS: bool(data[ROOMS]),
+        HAS_EMF: bool(data[EMF_REPORTS]),
+        HAS_COOLING: any(zone.cooling for zone in data[ZONES] or []),
+        HAS_DHW_TANK: bool(dhw and dhw.hotwater and dhw.hotwater.time_program),
+    }
+
+
+@callback
+def async_store_capabilities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    capabilities: Mapping[str, bool],
+    serial: str | None = None,
+) -> None:
+    """Store the capabilities of a system in the config entry."""
+    _LOGGER.debug("Storing capabilities %s of %s", capabilities, serial)
+    stored = {**capabilities, PROBED_AT: dt_util.utcnow().isoformat()}
+    if entry.data.get(CONF_FLEET):
+        stored = {**entry.data.get(CONF_CAPABILITIES, {}), serial: stored}
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_CAPABILITIES: stored}
+    )
+
+
+@callback
+def async_clear_capabilities(
+    hass: HomeAssistant, entry: ConfigEntry, serial: str | None = None
+) -> None:
+    """Forget the capabilities of a system, they are probed again at next setup."""
+    data = dict(entry.data)
+    if entry.data.get(CONF_FLEET):
+        data[CONF_CAPABILITIES] = {
+            other: probed
+            for other, probed in data.get(CONF_CAPABILITIES, {}).items()
+            if other != serial
+        }
+    else:
+        data.pop(CONF_CAPABILITIES, None)
+    hass.config_entries.async_update_entry(entry, data=data)
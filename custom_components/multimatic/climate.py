@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import abc
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 import logging
 from typing import Any
 
@@ -31,7 +31,7 @@ from homeassistant.components.climate import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -51,13 +51,15 @@ from .const import (
     ROOMS,
     SENSO,
     VENTILATION,
+    WRITE_MODE,
+    WRITE_TEMPERATURE,
     ZONES,
     CONF_APPLICATION,
 )
 from .coordinator import MultimaticCoordinator
 from .entities import MultimaticEntity
 from .service import SERVICE_REMOVE_QUICK_VETO, SERVICE_SET_QUICK_VETO
-from .utils import get_coordinator
+from .utils import async_setup_systems, get_coordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -72,38 +74,52 @@ async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the multimatic climate platform."""
-    climates: list[MultimaticClimate] = []
-    zones_coo = get_coordinator(hass, ZONES, entry.entry_id)
-    rooms_coo = get_coordinator(hass, ROOMS, entry.entry_id)
-    ventilation_coo = get_coordinator(hass, VENTILATION, entry.entry_id)
-    system_application = SENSO if entry.data[CONF_APPLICATION] == SENSO else MULTIMATIC
-
-    if zones_coo.data:
-        for zone in zones_coo.data:
-            if not zone.rbr and zone.enabled:
-                climates.append(ZoneClimate(zones_coo, zone, ventilation_coo.data, system_application))
 
-    if rooms_coo.data:
-        rbr_zone = next((zone for zone in zones_coo.data if zone.rbr), None)
-        for room in rooms_coo.data:
-            climates.append(RoomClimate(rooms_coo, zones_coo, room, rbr_zone))
+    # Systems set up later are out of the context of the platform setup
+    platform = entity_platform.async_get_current_platform()
+    system_application = SENSO if entry.data[CONF_APPLICATION] == SENSO else MULTIMATIC
 
-    _LOGGER.info("Adding %s climate entities", len(climates))
+    @callback
+    def async_setup_system(system_id: str) -> None:
+        climates: list[MultimaticClimate] = []
+        zones_coo = get_coordinator(hass, ZONES, system_id)
+        rooms_coo = get_coordinator(hass, ROOMS, system_id)
+        ventilation_coo = get_coordinator(hass, VENTILATION, system_id)
+
+        if zones_coo.data:
+            for zone in zones_coo.data:
+                if not zone.rbr and zone.enabled:
+                    climates.append(
+                        ZoneClimate(
+                            zones_coo,
+                            zone,
+                            ventilation_coo.data if ventilation_coo else None,
+                            system_application,
+                        )
+                    )
+
+        if rooms_coo and rooms_coo.data:
+            rbr_zone = next((zone for zone in zones_coo.data if zone.rbr), None)
+            for room in rooms_coo.data:
+                climates.append(RoomClimate(rooms_coo, zones_coo, room, rbr_zone))
+
+        _LOGGER.info("Adding %s climate entities", len(climates))
+
+        async_add_entities(climates)
+
+        if len(climates) > 0:
+            platform.async_register_entity_service(
+                SERVICE_REMOVE_QUICK_VETO,
+                SERVICES[SERVICE_REMOVE_QUICK_VETO]["schema"],
+                SERVICE_REMOVE_QUICK_VETO,
+            )
+            platform.async_register_entity_service(
+                SERVICE_SET_QUICK_VETO,
+                SERVICES[SERVICE_SET_QUICK_VETO]["schema"],
+                SERVICE_SET_QUICK_VETO,
+            )
 
-    async_add_entities(climates)
-
-    if len(climates) > 0:
-        platform = entity_platform.async_get_current_platform()
-        platform.async_register_entity_service(
-            SERVICE_REMOVE_QUICK_VETO,
-            SERVICES[SERVICE_REMOVE_QUICK_VETO]["schema"],
-            SERVICE_REMOVE_QUICK_VETO,
-        )
-        platform.async_register_entity_service(
-            SERVICE_SET_QUICK_VETO,
-            SERVICES[SERVICE_SET_QUICK_VETO]["schema"],
-            SERVICE_SET_QUICK_VETO,
-        )
+    async_setup_systems(hass, entry, async_setup_system)
 
 
 class MultimaticClimate(MultimaticEntity, ClimateEntity, abc.ABC):
@@ -117,6 +133,23 @@ class MultimaticClimate(MultimaticEntity, ClimateEntity, abc.ABC):
         """Initialize entity."""
         super().__init__(coordinator, DOMAIN, comp_id)
         self._comp_id = comp_id
+        self._derived: dict[str, Any] = {}
+        self._derived_generation = -1
+
+    def _memoize(self, name: str, compute: Callable[[], Any]) -> Any:
+        """Compute a derived state (hvac mode, preset, etc.) once per data update."""
+        generation = self.coordinator.api.generation
+        if self._derived_generation != generation:
+            self._derived = {}
+            self._derived_generation = generation
+        if name not in self._derived:
+            self._derived[name] = compute()
+        return self._derived[name]
+
+    def _pending_states(self, mapping: dict[Mode, list]) -> list | None:
+        """Get the hvac mode and preset of the mode about to be written, if any."""
+        pending = self.coordinator.api.pending_write(self, WRITE_MODE)
+        return mapping.get(pending) if pending is not None else None
 
     async def set_quick_veto(self, **kwargs):
         """Set quick veto, called by service."""
@@ -133,6 +166,11 @@ class MultimaticClimate(MultimaticEntity, ClimateEntity, abc.ABC):
         """Get active mode of the climate."""
         return self.coordinator.api.get_active_mode(self.component)
 
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return entity specific state attributes."""
+        return {**super().extra_state_attributes, **self._next_change_attributes()}
+
     @property
     @abc.abstractmethod
     def component(self) -> Component:
@@ -150,8 +188,9 @@ class MultimaticClimate(MultimaticEntity, ClimateEntity, abc.ABC):
 
     @property
     def target_temperature(self) -> float:
-        """Return the temperature we try to reach."""
-        return self.active_mode.target
+        """Return the temperature we try to reach (or about to be written)."""
+        pending = self.coordinator.api.pending_write(self, WRITE_TEMPERATURE)
+        return pending if pending is not None else self.active_mode.target
 
     @property
     def current_temperature(self) -> float:
@@ -261,14 +300,25 @@ class RoomClimate(MultimaticClimate):
             )
         return None
 
+    @property
+    def data_key(self) -> str:
+        """Return the key of the data the entity relies on."""
+        return self._room_id
+
     @property
     def component(self) -> Room:
         """Get the component."""
-        return self.coordinator.find_component(self._room_id)
+        return self.coordinator.find_component(Room, self._room_id)
 
     @property
     def hvac_mode(self) -> str:
-        """Get the hvac mode based on multimatic mode."""
+        """Get the hvac mode based on multimatic mode (or about to be written)."""
+        pending = self._pending_states(RoomClimate._MULTIMATIC_TO_HA)
+        if pending and pending[0]:
+            return pending[0]
+        return self._memoize("hvac_mode", self._hvac_mode)
+
+    def _hvac_mode(self) -> str:
         hvac_mode = RoomClimate._MULTIMATIC_TO_HA[self.active_mode.current][0]
         if not hvac_mode:
             if (
@@ -304,10 +354,8 @@ class RoomClimate(MultimaticClimate):
     @property
     def zone(self):
         """Return the zone the current room belongs."""
-        if self._zone_coo.data and self._zone_id:
-            return next(
-                (zone for zone in self._zone_coo.data if zone.id == self._zone_id), None
-            )
+        if self._zone_id:
+            return self._zone_coo.find_component(Zone, self._zone_id)
         return None
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
@@ -327,6 +375,12 @@ class RoomClimate(MultimaticClimate):
 
         Requires SUPPORT_PRESET_MODE.
         """
+        pending = self._pending_states(RoomClimate._MULTIMATIC_TO_HA)
+        if pending:
+            return pending[1]
+        return self._memoize("preset_mode", self._preset_mode)
+
+    def _preset_mode(self) -> str | None:
         return RoomClimate._MULTIMATIC_TO_HA[self.active_mode.current][1]
 
     @property
@@ -350,6 +404,9 @@ class RoomClimate(MultimaticClimate):
 
         Need to be one of CURRENT_HVAC_*.
         """
+        return self._memoize("hvac_action", self._hvac_action)
+
+    def _hvac_action(self) -> str | None:
         if (
             self.zone
             and self.zone.active_function == ActiveFunction.HEATING
@@ -464,21 +521,32 @@ class ZoneClimate(MultimaticClimate):
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """Return entity specific state attributes."""
-        attr = {}
+        attr = dict(super().extra_state_attributes)
         if self.active_mode.current == QuickModes.COOLING_FOR_X_DAYS:
             attr.update(
                 {"cooling_for_x_days_duration": self.active_mode.current.duration}
             )
         return attr
 
+    @property
+    def data_key(self) -> str:
+        """Return the key of the data the entity relies on."""
+        return self._zone_id
+
     @property
     def component(self) -> Zone:
         """Return the zone."""
-        return self.coordinator.find_component(self._zone_id)
+        return self.coordinator.find_component(Zone, self._zone_id)
 
     @property
     def hvac_mode(self) -> HVACMode:
-        """Get the hvac mode based on multimatic mode."""
+        """Get the hvac mode based on multimatic mode (or about to be written)."""
+        pending = self._pending_states(self._multimatic_mode)
+        if pending and pending[0]:
+            return pending[0]
+        return self._memoize("hvac_mode", self._hvac_mode)
+
+    def _hvac_mode(self) -> HVACMode:
         current_mode = self.active_mode.current
         hvac_mode = self._multimatic_mode[current_mode][0]
         if not hvac_mode:
@@ -522,16 +590,11 @@ class ZoneClimate(MultimaticClimate):
         """Return the maximum temperature."""
         return Zone.MAX_TARGET_TEMP
 
-    @property
-    def target_temperature(self) -> float:
-        """Return the temperature we try to reach."""
-        return self.active_mode.target
-
     async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperature."""
         temp = kwargs.get(ATTR_TEMPERATURE)
 
-        if temp and temp != self.active_mode.target:
+        if temp and temp != self.target_temperature:
             _LOGGER.debug("Setting target temp to %s", temp)
             await self.coordinator.api.set_zone_target_temperature(self, temp)
         else:
@@ -548,11 +611,20 @@ class ZoneClimate(MultimaticClimate):
 
         Need to be one of CURRENT_HVAC_*.
         """
+        return self._memoize("hvac_action", self._hvac_action)
+
+    def _hvac_action(self) -> str | None:
         return _FUNCTION_TO_HVAC_ACTION.get(self.component.active_function)
 
     @property
     def preset_mode(self) -> str | None:
         """Return the current preset mode, e.g., home, away, temp."""
+        pending = self._pending_states(self._multimatic_mode)
+        if pending:
+            return pending[1]
+        return self._memoize("preset_mode", self._preset_mode)
+
+    def _preset_mode(self) -> str | None:
         return self._multimatic_mode[self.active_mode.current][1]
 
     @property
@@ -0,0 +1,140 @@
+"""Coalescing of successive writes to the same entity."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from functools import partial
+import logging
+from typing import Any
+
+from aiohttp import ClientError
+from pymultimatic.api import ApiError
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WriteCoalescer:
+    """Collapse writes done within a short delay into the last one.
+
+    Dragging a thermostat slider leads to several target temperature changes
+    in a row, only the last one is sent to the API. Pending values can be
+    displayed by the entity in the meantime. Callers wait for the write
+    carrying their value and get its error, if any.
+    """
+
+    def __init__(self, hass: HomeAssistant, delay: float) -> None:
+        """Init."""
+        self._hass = hass
+        self._delay = delay
+        self._pending: dict[
+            str, dict[str, tuple[Any, Callable[[Any], Awaitable[None]]]]
+        ] = {}
+        self._flushes: dict[str, asyncio.Future[None]] = {}
+        self._timers: dict[str, CALLBACK_TYPE] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def pending(self, entity, operation: str) -> Any:
+        """Get the value waiting to be written, if any."""
+        pending = self._pending.get(entity.unique_id, {}).get(operation)
+        return pending[0] if pending else None
+
+    async def async_write(
+        self,
+        entity,
+        operation: str,
+        value: Any,
+        write: Callable[[Any], Awaitable[None]],
+    ) -> None:
+        """Write the value after the delay, unless another value comes in."""
+        if self._delay <= 0:
+            await write(value)
+            return
+
+        key = entity.unique_id
+        pending = self._pending.setdefault(key, {})
+        # Latest operation is written last
+        pending.pop(operation, None)
+        pending[operation] = (value, write)
+        entity.async_write_ha_state()
+
+        flush = self._flushes.get(key)
+        if flush is None:
+            flush = self._flushes[key] = self._hass.loop.create_future()
+        if unsub := self._timers.pop(key, None):
+            unsub()
+        self._timers[key] = async_call_later(
+            self._hass, self._delay, partial(self._async_start_flush, key)
+        )
+        await asyncio.shield(flush)
+
+    async def async_supersede(self, entity, operations: Iterable[str]) -> None:
+        """Drop the pending values of the operations, write the others now.
+
+        Used before writing the entity directly, callers of dropped values
+        get the result of the other pending writes.
+        """
+        key = entity.unique_id
+        pending = self._pending.get(key, {})
+        for operation in operations:
+            pending.pop(operation, None)
+        if unsub := self._timers.pop(key, None):
+            unsub()
+        # Also waits for a write already running
+        await self._async_flush(key)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Drop the pending writes, nothing is written anymore."""
+        for unsub in self._timers.values():
+            unsub()
+        for task in self._tasks:
+            task.cancel()
+        for flush in self._flushes.values():
+            flush.cancel()
+        self._timers = {}
+        self._flushes = {}
+        self._pending = {}
+
+    @callback
+    def _async_start_flush(self, key: str, _now) -> None:
+        self._timers.pop(key, None)
+        task = self._hass.async_create_task(self._async_flush(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _async_flush(self, key: str) -> None:
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            # Values coming in from now on go to the next flush
+            flush = self._flushes.pop(key, None)
+            pending = self._pending.get(key, {})
+            error: Exception | None = None
+            try:
+                for operation, item in list(pending.items()):
+                    try:
+                        await item[1](item[0])
+                    except (ApiError, asyncio.TimeoutError, ClientError) as err:
+                        _LOGGER.debug(
+                            "Cannot write %s for %s", operation, key, exc_info=True
+                        )
+                        error = error or err
+                    except Exception as err:  # pylint: disable=broad-except
+                        # Raised to the callers, they report it
+                        error = error or err
+                    finally:
+                        # Keep the value if a new one came in while writing
+                        if pending.get(operation) is item:
+                            del pending[operation]
+            except asyncio.CancelledError:
+                if flush:
+                    flush.cancel()
+                raise
+            if flush is None or flush.done():
+                return
+            if error:
+                flush.set_exception(error)
+            else:
+                flush.set_result(None)
@@ -1,8 +1,7 @@
 """Config flow for multimatic integration."""
 import logging
 
-from pymultimatic.api import ApiError, defaults
-from pymultimatic.systemmanager import SystemManager
+from pymultimatic.api import ApiError
 import voluptuous as vol
 
 from homeassistant import config_entries, core, exceptions
@@ -13,7 +12,27 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
 import homeassistant.helpers.config_validation as cv
 
-from .const import CONF_SERIAL_NUMBER, DEFAULT_SCAN_INTERVAL, DOMAIN, CONF_APPLICATION
+from .account import account_id, async_get_account, async_release_account
+from .auth import AuthConnector
+from .budget import RequestBudget
+from .const import (
+    ACCOUNTS,
+    CONF_APPLICATION,
+    CONF_FLEET,
+    CONF_MAX_CONCURRENCY,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_SERIAL_NUMBER,
+    CONF_SNAPSHOT_MODE,
+    CONF_HOURLY_BUDGET,
+    CONF_WRITE_DELAY,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_HOURLY_BUDGET,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SNAPSHOT_MODE,
+    DEFAULT_WRITE_DELAY,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,6 +42,7 @@ DATA_SCHEMA = vol.Schema(
         vol.Required(CONF_PASSWORD): str,
         vol.Optional(CONF_SERIAL_NUMBER): str,
         vol.Required(CONF_APPLICATION, default="MULTIMATIC"): vol.In(["MULTIMATIC", "SENSO"]),
+        vol.Optional(CONF_FLEET, default=False): bool,
     }
 )
 
@@ -39,15 +59,38 @@ async def validate_input(hass: core.HomeAssistant, data):
 
 
 async def validate_authentication(hass, username, password, application):
-    """Ensure provided credentials are working."""
+    """Ensure provided credentials are working.
+
+    The session of the account is reused when an entry already uses the same
+    credentials.
+    """
+    account = hass.data.get(ACCOUNTS, {}).get(account_id(username, application))
+    if account and account.entries:
+        if account.connector.has_password(password):
+            if await account.connector.is_logged():
+                return
+            await _login(account.connector)
+        else:
+            # Don't break the session of running entries with a wrong password
+            session = async_create_clientsession(hass)
+            try:
+                await _login(
+                    AuthConnector(username, password, session, 1, RequestBudget(0))
+                )
+            finally:
+                await session.close()
+        return
+
+    account = await async_get_account(hass, username, password, application)
     try:
-        systemApplication = defaults.SENSO if application == "SENSO" else defaults.MULTIMATIC
-        if not await SystemManager(
-            user=username,
-            password=password,
-            session=async_create_clientsession(hass),
-            application=systemApplication,
-        ).login(True):
+        await _login(account.connector)
+    finally:
+        await async_release_account(hass, account)
+
+
+async def _login(connector: AuthConnector) -> None:
+    try:
+        if not await connector.login(True):
             raise InvalidAuth
     except ApiError as err:
         _LOGGER.error(
@@ -78,6 +121,16 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             try:
                 info = await validate_input(self.hass, user_input)
 
+                if user_input.get(CONF_FLEET):
+                    # Systems are discovered and set up by the fleet entry
+                    await self.async_set_unique_id(
+                        f"fleet_{account_id(user_input[CONF_USERNAME], user_input[CONF_APPLICATION])}"
+                    )
+                    self._abort_if_unique_id_configured()
+                    user_input.pop(CONF_SERIAL_NUMBER, None)
+                    return self.async_create_entry(
+                        title=f"{info['title']} fleet", data=user_input
+                    )
                 return self.async_create_entry(title=info["title"], data=user_input)
             except CannotConnect:
                 errors["base"] = "cannot_connect"
@@ -111,7 +164,37 @@ class MultimaticOptionsFlowHandler(config_entries.OptionsFlow):
                     default=self.config_entry.options.get(
                         CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                     ),
-                ): cv.positive_int
+                ): cv.positive_int,
+                vol.Optional(
+                    CONF_MAX_SCAN_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+                    ),
+                ): cv.positive_int,
+                vol.Optional(
+                    CONF_SNAPSHOT_MODE,
+                    default=self.config_entry.options.get(
+                        CONF_SNAPSHOT_MODE, DEFAULT_SNAPSHOT_MODE
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_MAX_CONCURRENCY,
+                    default=self.config_entry.options.get(
+                        CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Clamp(min=1, max=12)),
+                vol.Optional(
+                    CONF_WRITE_DELAY,
+                    default=self.config_entry.options.get(
+                        CONF_WRITE_DELAY, DEFAULT_WRITE_DELAY
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Clamp(min=0, max=30)),
+                vol.Optional(
+                    CONF_HOURLY_BUDGET,
+                    default=self.config_entry.options.get(
+                        CONF_HOURLY_BUDGET, DEFAULT_HOURLY_BUDGET
+                    ),
+                ): cv.positive_int,
             }
         )
         return self.async_show_form(step_id="init", data_schema=data_schema)
@@ -25,8 +25,20 @@ PRESET_COOLING_FOR_X_DAYS = "cooling_for_x_days"
 # default values for configuration
 DEFAULT_EMPTY = ""
 DEFAULT_SCAN_INTERVAL = 2
+DEFAULT_MAX_SCAN_INTERVAL = 10
 DEFAULT_QUICK_VETO_DURATION = 3 * 60
 DEFAULT_SMART_PHONE_ID = "homeassistant"
+DEFAULT_SNAPSHOT_MODE = False
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_ENDPOINT_TIMEOUT = 15
+# seconds the first fetch of an endpoint can take at setup, waits and retries
+# included, the endpoint is fetched again at next poll otherwise
+FIRST_FETCH_DEADLINE = 30
+DEFAULT_WRITE_DELAY = 2
+# requests per hour of an account, `0` is unlimited
+DEFAULT_HOURLY_BUDGET = 0
+# max concurrent requests of an account, whatever the number of entries
+DEFAULT_ACCOUNT_CONCURRENCY = 8
 
 # max and min values for quick veto
 MIN_QUICK_VETO_DURATION = 0.5 * 60
@@ -36,6 +48,14 @@ MAX_QUICK_VETO_DURATION = 24 * 60
 CONF_QUICK_VETO_DURATION = "quick_veto_duration"
 CONF_SERIAL_NUMBER = "serial_number"
 CONF_APPLICATION = "application"
+CONF_SNAPSHOT_MODE = "snapshot_mode"
+CONF_MAX_CONCURRENCY = "max_concurrency"
+CONF_WRITE_DELAY = "write_delay"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_HOURLY_BUDGET = "hourly_budget"
+CONF_CAPABILITIES = "capabilities"
+CONF_FLEET = "fleet"
+CONF_SYSTEMS = "systems"
 
 # constants for states_attributes
 ATTR_QUICK_MODE = "quick_mode"
@@ -45,10 +65,27 @@ ATTR_TEMPERATURE = "temperature"
 ATTR_DURATION = "duration"
 ATTR_LEVEL = "level"
 ATTR_DATE_TIME = "datetime"
+ATTR_STALE = "stale"
+ATTR_NEXT_CHANGE = "next_change"
+ATTR_NEXT_TARGET = "next_target"
+ATTR_TARGETS = "targets"
+ATTR_OPERATING_MODE = "operating_mode"
+ATTR_RESULTS = "results"
 
 SERVICES_HANDLER = "services_handler"
+ACCOUNTS = "multimatic_accounts"
+ACCOUNT = "account"
+API = "api"
+SYSTEMS = "systems"
+READY = "ready"
 
-REFRESH_EVENT = "multimatic_refresh_event"
+# coalesced write operations
+WRITE_TEMPERATURE = "temperature"
+WRITE_MODE = "mode"
+
+SIGNAL_REFRESH = "multimatic_refresh_{}"
+SIGNAL_SYSTEM_READY = "multimatic_system_ready_{}"
+EVENT_APPLY_STATE = "multimatic_apply_state"
 
 # Update api keys
 ZONES = "zones"
@@ -64,6 +101,7 @@ FACILITY_DETAIL = "facility_detail"
 GATEWAY = "gateway"
 EMF_REPORTS = "emf_reports"
 COORDINATORS = "coordinators"
+SNAPSHOT = "snapshot"
 COORDINATOR_LIST: dict[str, timedelta | None] = {
     ZONES: None,
     ROOMS: None,
@@ -71,10 +109,18 @@ COORDINATOR_LIST: dict[str, timedelta | None] = {
     REPORTS: None,
     OUTDOOR_TEMP: None,
     VENTILATION: None,
-    QUICK_MODE: None,
-    HOLIDAY_MODE: None,
+    # Expiry is tracked locally, see ExpiryTracker
+    QUICK_MODE: timedelta(minutes=30),
+    HOLIDAY_MODE: timedelta(minutes=30),
     HVAC_STATUS: None,
     FACILITY_DETAIL: timedelta(days=1),
     GATEWAY: timedelta(days=1),
     EMF_REPORTS: None,
 }
+
+# timeout (in seconds) of each call to the API, per coordinator key
+ENDPOINT_TIMEOUTS: dict[str, int] = {
+    DHW: 25,
+    # Slowest endpoint of the API
+    EMF_REPORTS: 45,
+}
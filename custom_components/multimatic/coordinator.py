@@ -1,13 +1,24 @@
 """Api hub and integration data."""
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
 import logging
+from types import MappingProxyType
+from typing import Any
 
+import attr
+from aiohttp import ClientError
 from pymultimatic.api import ApiError, defaults
+from pymultimatic.api.connector import Connector
 from pymultimatic.model import (
+    ActiveMode,
     Circulation,
     Component,
+    Dhw,
     HolidayMode,
     HotWater,
     Mode,
@@ -15,6 +26,7 @@ from pymultimatic.model import (
     QuickMode,
     QuickModes,
     QuickVeto,
+    Report,
     Room,
     Ventilation,
     Zone,
@@ -26,53 +38,189 @@ import pymultimatic.utils as multimatic_utils
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .account import Account
+from .breaker import ENDPOINT_THRESHOLD, CircuitBreaker, is_transient
+from .cache import SnapshotCache
+from .capabilities import HAS_DHW_TANK, entry_capabilities
+from .coalescer import WriteCoalescer
 from .const import (
     CONF_APPLICATION,
-    CONF_SERIAL_NUMBER,
+    CONF_MAX_CONCURRENCY,
+    CONF_WRITE_DELAY,
+    DEFAULT_ENDPOINT_TIMEOUT,
+    DEFAULT_MAX_CONCURRENCY,
     DOMAIN as MULTIMATIC,
     DEFAULT_QUICK_VETO_DURATION,
+    DEFAULT_WRITE_DELAY,
+    ENDPOINT_TIMEOUTS,
+    FACILITY_DETAIL,
+    FIRST_FETCH_DEADLINE,
+    GATEWAY,
     HOLIDAY_MODE,
     QUICK_MODE,
-    REFRESH_EVENT,
+    REPORTS,
+    SIGNAL_REFRESH,
+    WRITE_MODE,
+    WRITE_TEMPERATURE,
     SENSO,
 )
-from .utils import (
-    holiday_mode_from_json,
-    holiday_mode_to_json,
-    quick_mode_from_json,
-    quick_mode_to_json,
+from .index import SystemIndex
+from .expiry import ExpiryTracker, quick_mode_duration
+from .interval import BOOST_DURATION, AdaptiveInterval
+from .planner import WritePlan
+from .scheduler import (
+    PRIORITY_CONFIRM,
+    PRIORITY_METADATA,
+    PRIORITY_POLL,
+    request_priority,
+    request_timeout,
+)
+from .timeprogram import (
+    TIME_PROGRAM_MODES,
+    SwitchPointTracker,
+    TimeProgramCompiler,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Keys which rarely change, fetched after everything else
+METADATA_KEYS = (FACILITY_DETAIL, GATEWAY)
+# Leave some time to the system to apply a write before reading it again
+CONFIRM_DELAY = timedelta(seconds=10)
+# Live reports fetched more recently are used instead of asking the report again
+LIVE_REPORT_MAX_AGE = timedelta(minutes=5)
+DHW_TANK_REPORT = ("Control_DHW", "DomesticHotWaterTankTemperature")
+# Keys whose data can be fetched item by item
+NARROW_KEYS = (REPORTS,)
+# Fetching reports one by one only saves data, not requests: one report costs
+# as much as all of them
+NARROW_REPORTS_MAX = 1
+
 
 class MultimaticApi:
     """Utility to interact with multimatic API."""
 
-    def __init__(self, hass, entry: ConfigEntry):
+    def __init__(
+        self,
+        hass,
+        entry: ConfigEntry,
+        account: Account,
+        system_id: str,
+        serial: str | None,
+    ):
         """Init."""
 
-        self.serial = entry.data.get(CONF_SERIAL_NUMBER)
+        self.serial = serial
         self.fixed_serial = self.serial is not None
+        self.entry_id = entry.entry_id
+        self.refresh_signal = SIGNAL_REFRESH.format(system_id)
 
-        username = entry.data[CONF_USERNAME]
-        password = entry.data[CONF_PASSWORD]
         systemApplication = defaults.SENSO if entry.data[CONF_APPLICATION] == SENSO else defaults.MULTIMATIC
 
+        self.account = account
         self._manager = pymultimatic.systemmanager.SystemManager(
-            user=username,
-            password=password,
-            session=async_create_clientsession(hass),
+            user=entry.data[CONF_USERNAME],
+            password=entry.data[CONF_PASSWORD],
+            session=account.session,
             serial=self.serial,
             application=systemApplication,
         )
-
-        self._quick_mode: QuickMode | None = None
-        self._holiday_mode: HolidayMode | None = None
+        # Session and authentication are shared by all the systems of the account.
+        # SystemManager (pymultimatic 0.7, pinned in the manifest) always builds
+        # its own connector, it's replaced by the one of the account.
+        if not isinstance(getattr(self._manager, "_connector", None), Connector):
+            raise RuntimeError(
+                "Unsupported pymultimatic version, cannot share the account session"
+            )
+        self._manager._connector = account.connector
+
+        self._current_quick_mode: QuickMode | None = None
+        self._current_holiday_mode: HolidayMode | None = None
+        self._active_modes: dict[int, tuple[Component, ActiveMode | None]] = {}
+        self.time_programs = TimeProgramCompiler()
+        self.expiry = ExpiryTracker(hass)
+        self.generation = 0
         self._hass = hass
+        self._max_concurrency = entry.options.get(
+            CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+        )
+        self._fetch_semaphore = asyncio.Semaphore(self._max_concurrency)
+        self._coalescer = WriteCoalescer(
+            hass, entry.options.get(CONF_WRITE_DELAY, DEFAULT_WRITE_DELAY)
+        )
+        self._batch: dict[Any, bool] | None = None
+        self._live_reports: dict[tuple[str | None, str], Report] = {}
+        self._live_reports_at: datetime | None = None
+        self._dhw_has_tank: bool | None = entry_capabilities(entry, serial).get(
+            HAS_DHW_TANK
+        )
+        self.entities: dict[str, Any] = {}
+
+    @property
+    def _quick_mode(self) -> QuickMode | None:
+        return self._current_quick_mode
+
+    @_quick_mode.setter
+    def _quick_mode(self, quick_mode: QuickMode | None) -> None:
+        self._current_quick_mode = quick_mode
+        self.invalidate_active_modes()
+
+    @property
+    def _holiday_mode(self) -> HolidayMode | None:
+        return self._current_holiday_mode
+
+    @_holiday_mode.setter
+    def _holiday_mode(self, holiday_mode: HolidayMode | None) -> None:
+        self._current_holiday_mode = holiday_mode
+        self.invalidate_active_modes()
+
+    async def fetch(self, key: str, subscribed: set | None = None):
+        """Get data for a coordinator key.
+
+        Calls are bounded by the configured concurrency and each HTTP call has
+        the timeout of the endpoint, so a slow endpoint doesn't hold up the
+        others. Calls are sent as background polling. `subscribed` holds the keys of the data used by
+        entities, endpoints allowing it only fetch these.
+        """
+        timeout = ENDPOINT_TIMEOUTS.get(key, DEFAULT_ENDPOINT_TIMEOUT)
+        priority = PRIORITY_METADATA if key in METADATA_KEYS else PRIORITY_POLL
+        async with self._fetch_semaphore:
+            with request_priority(priority), request_timeout(timeout):
+                fetch_method = getattr(self, "get_" + key)
+                if key in NARROW_KEYS:
+                    return await fetch_method(subscribed)
+                return await fetch_method()
+
+    async def fetch_component(self, comp: Component):
+        """Read a single component again, to confirm a write."""
+        with request_priority(PRIORITY_CONFIRM), request_timeout(
+            DEFAULT_ENDPOINT_TIMEOUT
+        ):
+            return await self._get_component(comp)
+
+    async def _get_component(self, comp: Component):
+        if isinstance(comp, Room):
+            return await self._manager.get_room(comp.id)
+        if isinstance(comp, Zone):
+            return await self._manager.get_zone(comp.id)
+        if isinstance(comp, HotWater):
+            hotwater = await self._manager.get_hot_water(comp.id)
+            if hotwater and hotwater.temperature is None:
+                # Tank temperature comes from a live report, not read here
+                hotwater.temperature = comp.temperature
+            return hotwater
+        if isinstance(comp, Ventilation):
+            return await self._manager.get_ventilation()
+        return None
 
     async def login(self, force):
         """Login to the API."""
@@ -116,23 +264,81 @@ class MultimaticApi:
     async def get_dhw(self):
         """Get domestic hot water.
 
-        There is a 2 queries here, one to ge the dhw and a second one to get the current temperature if
-        there is a water tank.
+        The current temperature of the water tank, if any, is a live report. It's
+        taken from the last live reports when they are recent enough, otherwise
+        it's asked at the same time as the dhw.
         """
         _LOGGER.debug("Will get dhw")
-        dhw = await self._manager.get_dhw()
-        if dhw and dhw.hotwater and dhw.hotwater.time_program:
+        report = self._recent_live_report(DHW_TANK_REPORT)
+        asked = report is None and self._dhw_has_tank
+        if asked:
             _LOGGER.debug("Will get temperature report")
-            report = await self._manager.get_live_report(
-                "DomesticHotWaterTankTemperature", "Control_DHW"
+            dhw, report = await asyncio.gather(
+                self._manager.get_dhw(), self._get_tank_report()
             )
+        else:
+            dhw = await self._manager.get_dhw()
+
+        self._dhw_has_tank = bool(dhw and dhw.hotwater and dhw.hotwater.time_program)
+        if self._dhw_has_tank:
+            if report is None and not asked:
+                # Tank is unknown until the first dhw, report is then asked after
+                _LOGGER.debug("Will get temperature report")
+                report = await self._get_tank_report()
             dhw.hotwater.temperature = report.value if report else None
         return dhw
 
-    async def get_live_reports(self):
-        """Get reports."""
+    async def _get_tank_report(self) -> Report | None:
+        device_id, report_id = DHW_TANK_REPORT
+        return await self._manager.get_live_report(report_id, device_id)
+
+    def _recent_live_report(self, key: tuple[str, str]) -> Report | None:
+        if (
+            self._live_reports_at is None
+            or dt_util.utcnow() - self._live_reports_at > LIVE_REPORT_MAX_AGE
+        ):
+            return None
+        return self._live_reports.get(key)
+
+    async def get_live_reports(self, subscribed: set | None = None):
+        """Get reports, only the used one when a single one is used.
+
+        The tank temperature is counted in, it's taken from here by `get_dhw`.
+        """
+        if subscribed:
+            keys = set(subscribed)
+            if self._dhw_has_tank:
+                keys.add(DHW_TANK_REPORT)
+            if len(keys) <= NARROW_REPORTS_MAX and keys <= self._live_reports.keys():
+                return await self._get_some_live_reports(keys)
+
         _LOGGER.debug("Will get reports")
-        return await self._manager.get_live_reports()
+        reports = await self._manager.get_live_reports()
+        self._live_reports = {
+            (report.device_id, report.id): report for report in reports or []
+        }
+        self._live_reports_at = dt_util.utcnow()
+        return reports
+
+    async def _get_some_live_reports(self, keys: set) -> list[Report]:
+        """Update the given reports, the others keep their previous value."""
+        _LOGGER.debug("Will get reports %s", keys)
+        keys = list(keys)
+        reports = await asyncio.gather(
+            *(
+                self._manager.get_live_report(report_id, device_id)
+                for device_id, report_id in keys
+            )
+        )
+        for key, report in zip(keys, reports):
+            if report is not None:
+                # A single report doesn't come with its device
+                self._live_reports[key] = attr.evolve(
+                    self._live_reports[key], value=report.value
+                )
+                if key == DHW_TANK_REPORT:
+                    self._live_reports_at = dt_util.utcnow()
+        return list(self._live_reports.values())
 
     async def get_quick_mode(self):
         """Get quick modes."""
@@ -162,21 +368,73 @@ class MultimaticApi:
         The request update will trigger something at multimatic API and it will
         ask data to your system.
         """
+        breaker = self.account.breaker
+        if not breaker.allow():
+            _LOGGER.warning("API is unavailable, request_hvac_update is skipped")
+            return
         try:
             _LOGGER.debug("Will request_hvac_update")
             await self._manager.request_hvac_update()
+            breaker.record_success()
         except ApiError as err:
+            if is_transient(err):
+                breaker.record_failure(err)
             if err.status >= 500:
                 raise
             _LOGGER.warning("Request_hvac_update is done too often", exc_info=True)
 
+    def restore(self, data: Mapping[str, Any]) -> None:
+        """Restore system wide modes from cached data."""
+        if QUICK_MODE in data:
+            self._quick_mode = data[QUICK_MODE]
+        if HOLIDAY_MODE in data:
+            self._holiday_mode = data[HOLIDAY_MODE]
+
+    def pending_write(self, entity, operation: str):
+        """Get the value waiting to be written for the entity, if any."""
+        return self._coalescer.pending(entity, operation)
+
     def get_active_mode(self, comp: Component):
-        """Get active mode for room, zone, circulation, ventilaton or hotwater, no IO."""
-        return multimatic_utils.active_mode_for(
+        """Get active mode for room, zone, circulation, ventilaton or hotwater, no IO.
+
+        Active modes are computed once per component until data changes.
+        """
+        cached = self._active_modes.get(id(comp))
+        if cached and cached[0] is comp:
+            return cached[1]
+        mode = multimatic_utils.active_mode_for(
             comp, self._holiday_mode, self._quick_mode
         )
+        if mode:
+            # Time program is evaluated up to the minute of the switch
+            mode = self.time_programs.active_mode(comp, mode)
+        self._active_modes[id(comp)] = (comp, mode)
+        return mode
+
+    def get_next_change(self, comp: Component) -> tuple[datetime, ActiveMode] | None:
+        """Get when the time program changes the active mode next, no IO."""
+        mode = self.get_active_mode(comp)
+        if mode is None or mode.current not in TIME_PROGRAM_MODES:
+            return None
+        return self.time_programs.next_change(comp)
+
+    @callback
+    def invalidate_active_modes(self) -> None:
+        """Forget computed active modes (and derived states), data has changed."""
+        self._active_modes = {}
+        self.time_programs.clear()
+        self.generation += 1
 
     async def set_hot_water_target_temperature(self, entity, target_temp):
+        """Set hot water target temperature, successive calls are coalesced."""
+        await self._coalescer.async_write(
+            entity,
+            WRITE_TEMPERATURE,
+            target_temp,
+            partial(self._set_hot_water_target_temperature, entity),
+        )
+
+    async def _set_hot_water_target_temperature(self, entity, target_temp):
         """Set hot water target temperature.
 
         * If there is a quick mode that impact dhw running on or holiday mode,
@@ -188,20 +446,49 @@ class MultimaticApi:
         """
 
         hotwater = entity.component
-        touch_system = await self._remove_quick_mode_or_holiday(entity)
-        current_mode = self.get_active_mode(hotwater).current
-
-        if current_mode == OperatingModes.OFF:
-            await self._manager.set_hot_water_operating_mode(
-                hotwater.id, OperatingModes.ON
+        plan = WritePlan()
+        touch_system, active_mode = self._plan_remove_quick_mode_or_holiday(
+            plan, entity
+        )
+        turn_on = active_mode.current == OperatingModes.OFF
+
+        plan.then()
+        if turn_on:
+            plan.add(
+                "turn hot water on",
+                partial(
+                    self._manager.set_hot_water_operating_mode,
+                    hotwater.id,
+                    OperatingModes.ON,
+                ),
+            )
+        if turn_on or hotwater.target_high != target_temp:
+            plan.add(
+                "set hot water setpoint",
+                partial(
+                    self._manager.set_hot_water_setpoint_temperature,
+                    hotwater.id,
+                    target_temp,
+                ),
             )
+        await plan.async_execute()
+
+        if turn_on:
             hotwater.operating_mode = OperatingModes.ON
-        await self._manager.set_hot_water_setpoint_temperature(hotwater.id, target_temp)
         hotwater.target_high = target_temp
 
         await self._refresh(touch_system, entity)
 
     async def set_room_target_temperature(self, entity, target_temp):
+        """Set target temperature for a room, successive calls are coalesced."""
+        await self._coalescer.async_write(
+            entity,
+            WRITE_TEMPERATURE,
+            target_temp,
+            partial(self._set_room_target_temperature, entity),
+        )
+
+    async def _set_room_target_temperature(self, entity, target_temp):
         """Set target temperature for a room.
 
         * If there is a quick mode that impact room running on or holiday mode,
@@ -212,25 +499,62 @@ class MultimaticApi:
         * if the room is not in MANUAL mode, create à quick veto.
         """
 
-        touch_system = await self._remove_quick_mode_or_holiday(entity)
-
         room = entity.component
-        current_mode = self.get_active_mode(room).current
+        plan = WritePlan()
+        touch_system, active_mode = self._plan_remove_quick_mode_or_holiday(
+            plan, entity
+        )
+        current_mode = active_mode.current
 
+        plan.then()
+        qveto = None
         if current_mode == OperatingModes.MANUAL:
-            await self._manager.set_room_setpoint_temperature(room.id, target_temp)
-            room.target_temperature = target_temp
+            if room.target_temperature != target_temp:
+                plan.add(
+                    "set room setpoint",
+                    partial(
+                        self._manager.set_room_setpoint_temperature,
+                        room.id,
+                        target_temp,
+                    ),
+                )
         else:
             if current_mode == OperatingModes.QUICK_VETO:
-                await self._manager.remove_room_quick_veto(room.id)
+                plan.add(
+                    "remove room quick veto",
+                    partial(self._manager.remove_room_quick_veto, room.id),
+                )
+                plan.then()
 
             qveto = QuickVeto(DEFAULT_QUICK_VETO_DURATION, target_temp)
-            await self._manager.set_room_quick_veto(room.id, qveto)
+            plan.add(
+                "set room quick veto",
+                partial(self._manager.set_room_quick_veto, room.id, qveto),
+            )
+        await plan.async_execute()
+
+        if qveto:
+            self.expiry.register_veto(
+                entity.coordinator.key,
+                room.id,
+                timedelta(minutes=DEFAULT_QUICK_VETO_DURATION),
+            )
             room.quick_veto = qveto
+        else:
+            room.target_temperature = target_temp
 
         await self._refresh(touch_system, entity)
 
     async def set_zone_target_temperature(self, entity, target_temp):
+        """Set target temperature for a zone, successive calls are coalesced."""
+        await self._coalescer.async_write(
+            entity,
+            WRITE_TEMPERATURE,
+            target_temp,
+            partial(self._set_zone_target_temperature, entity),
+        )
+
+    async def _set_zone_target_temperature(self, entity, target_temp):
         """Set target temperature for a zone.
 
         * If there is a quick mode related to zone running or holiday mode,
@@ -242,82 +566,168 @@ class MultimaticApi:
         * If any other mode, create a quick veto
         """
 
-        touch_system = await self._remove_quick_mode_or_holiday(entity)
         zone = entity.component
+        plan = WritePlan()
+        touch_system, active_mode = self._plan_remove_quick_mode_or_holiday(
+            plan, entity
+        )
 
-        current_mode = self.get_active_mode(zone).current
-
-        if current_mode == OperatingModes.QUICK_VETO:
-            await self._manager.remove_zone_quick_veto(zone.id)
+        plan.then()
+        if active_mode.current == OperatingModes.QUICK_VETO:
+            plan.add(
+                "remove zone quick veto",
+                partial(self._manager.remove_zone_quick_veto, zone.id),
+            )
+            plan.then()
 
         # Senso needs a duration, applying the same duration as the Multimatic default.
         duration = (DEFAULT_QUICK_VETO_DURATION // 60) if self._manager._application == defaults.SENSO else 360
         veto = QuickVeto(duration, target_temp)
-        await self._manager.set_zone_quick_veto(zone.id, veto)
+        plan.add(
+            "set zone quick veto",
+            partial(self._manager.set_zone_quick_veto, zone.id, veto),
+        )
+        await plan.async_execute()
+        self.expiry.register_veto(
+            entity.coordinator.key,
+            zone.id,
+            timedelta(hours=duration)
+            if self._manager._application == defaults.SENSO
+            else timedelta(minutes=duration),
+        )
         zone.quick_veto = veto
 
         await self._refresh(touch_system, entity)
 
     async def set_hot_water_operating_mode(self, entity, mode):
+        """Set hot water operation mode, successive calls are coalesced."""
+        await self._coalescer.async_write(
+            entity,
+            WRITE_MODE,
+            mode,
+            partial(self._set_hot_water_operating_mode, entity),
+        )
+
+    async def _set_hot_water_operating_mode(self, entity, mode):
         """Set hot water operation mode.
 
         If there is a quick mode that impact hot warter running on or holiday
         mode, remove it.
         """
         hotwater = entity.component
-        touch_system = await self._remove_quick_mode_or_holiday(entity)
+        plan = WritePlan()
+        touch_system, _ = self._plan_remove_quick_mode_or_holiday(plan, entity)
 
-        await self._manager.set_hot_water_operating_mode(hotwater.id, mode)
+        if hotwater.operating_mode != mode:
+            plan.add(
+                "set hot water operating mode",
+                partial(self._manager.set_hot_water_operating_mode, hotwater.id, mode),
+            )
+        await plan.async_execute()
         hotwater.operating_mode = mode
 
         await self._refresh(touch_system, entity)
 
     async def set_room_operating_mode(self, entity, mode):
+        """Set room operation mode, successive calls are coalesced."""
+        await self._coalescer.async_write(
+            entity,
+            WRITE_MODE,
+            mode,
+            partial(self._set_room_operating_mode, entity),
+        )
+
+    async def _set_room_operating_mode(self, entity, mode):
         """Set room operation mode.
 
         If there is a quick mode that impact room running on or holiday mode,
         remove it.
         """
-        touch_system = await self._remove_quick_mode_or_holiday(entity)
         room = entity.component
+        plan = WritePlan()
+        touch_system, _ = self._plan_remove_quick_mode_or_holiday(plan, entity)
+
         if room.quick_veto is not None:
-            await self._manager.remove_room_quick_veto(room.id)
-            room.quick_veto = None
+            plan.add(
+                "remove room quick veto",
+                partial(self._manager.remove_room_quick_veto, room.id),
+            )
 
         if isinstance(mode, QuickMode):
-            await self._hard_set_quick_mode(mode)
-            self._quick_mode = mode
+            plan.then()
+            plan.add("set quick mode", partial(self._hard_set_quick_mode, mode))
             touch_system = True
+        elif room.operating_mode != mode:
+            plan.add(
+                "set room operating mode",
+                partial(self._manager.set_room_operating_mode, room.id, mode),
+            )
+        await plan.async_execute()
+
+        room.quick_veto = None
+        if isinstance(mode, QuickMode):
+            self._quick_mode = mode
         else:
-            await self._manager.set_room_operating_mode(room.id, mode)
             room.operating_mode = mode
 
         await self._refresh(touch_system, entity)
 
     async def set_zone_operating_mode(self, entity, mode):
+        """Set zone operation mode, successive calls are coalesced."""
+        await self._coalescer.async_write(
+            entity,
+            WRITE_MODE,
+            mode,
+            partial(self._set_zone_operating_mode, entity),
+        )
+
+    async def _set_zone_operating_mode(self, entity, mode):
         """Set zone operation mode.
 
         If there is a quick mode that impact zone running on or holiday mode,
         remove it.
         """
-        touch_system = await self._remove_quick_mode_or_holiday(entity)
         zone = entity.component
+        plan = WritePlan()
+        touch_system, _ = self._plan_remove_quick_mode_or_holiday(plan, entity)
 
         if zone.quick_veto is not None:
-            await self._manager.remove_zone_quick_veto(zone.id)
-            zone.quick_veto = None
+            plan.add(
+                "remove zone quick veto",
+                partial(self._manager.remove_zone_quick_veto, zone.id),
+            )
 
+        set_heating = set_cooling = False
         if isinstance(mode, QuickMode):
-            await self._hard_set_quick_mode(mode)
-            self._quick_mode = mode
+            plan.then()
+            plan.add("set quick mode", partial(self._hard_set_quick_mode, mode))
             touch_system = True
         else:
-            if zone.heating and mode in ZoneHeating.MODES:
-                await self._manager.set_zone_heating_operating_mode(zone.id, mode)
-                zone.heating.operating_mode = mode
-            if zone.cooling and mode in ZoneCooling.MODES:
-                await self._manager.set_zone_cooling_operating_mode(zone.id, mode)
-                zone.cooling.operating_mode = mode
+            set_heating = zone.heating and mode in ZoneHeating.MODES
+            set_cooling = zone.cooling and mode in ZoneCooling.MODES
+            if set_heating and zone.heating.operating_mode != mode:
+                plan.add(
+                    "set zone heating operating mode",
+                    partial(
+                        self._manager.set_zone_heating_operating_mode, zone.id, mode
+                    ),
+                )
+            if set_cooling and zone.cooling.operating_mode != mode:
+                plan.add(
+                    "set zone cooling operating mode",
+                    partial(
+                        self._manager.set_zone_cooling_operating_mode, zone.id, mode
+                    ),
+                )
+        await plan.async_execute()
+
+        zone.quick_veto = None
+        if isinstance(mode, QuickMode):
+            self._quick_mode = mode
+        if set_heating:
+            zone.heating.operating_mode = mode
+        if set_cooling:
+            zone.cooling.operating_mode = mode
 
         await self._refresh(touch_system, entity)
 
@@ -343,7 +753,8 @@ class MultimaticApi:
 
     async def set_quick_mode(self, mode, duration):
         """Set quick mode (remove previous one)."""
-        await self._remove_quick_mode_no_refresh()
+        if self._quick_mode:
+            await self._hard_remove_quick_mode()
         self._quick_mode = await self._hard_set_quick_mode(mode, duration)
         await self._refresh_entities()
 
@@ -352,6 +763,7 @@ class MultimaticApi:
         comp = entity.component
 
         q_duration = duration if duration else DEFAULT_QUICK_VETO_DURATION
+        expires_in = timedelta(minutes=q_duration)
         # For senso, the duration is in hours
         if self._manager._application == defaults.SENSO:
             q_duration = q_duration / 60
@@ -365,6 +777,7 @@ class MultimaticApi:
             if comp.quick_veto:
                 await self._manager.remove_room_quick_veto(comp.id)
             await self._manager.set_room_quick_veto(comp.id, qveto)
+        self.expiry.register_veto(entity.coordinator.key, comp.id, expires_in)
         comp.quick_veto = qveto
         await self._refresh(False, entity)
 
@@ -381,21 +794,117 @@ class MultimaticApi:
             await self._refresh(False, entity)
 
     async def set_fan_operating_mode(self, entity, mode: Mode):
+        """Set fan operating mode, successive calls are coalesced."""
+        await self._coalescer.async_write(
+            entity,
+            WRITE_MODE,
+            mode,
+            partial(self._set_fan_operating_mode, entity),
+        )
+
+    async def _set_fan_operating_mode(self, entity, mode: Mode):
         """Set fan operating mode."""
 
-        touch_system = await self._remove_quick_mode_or_holiday(entity)
+        ventilation = entity.component
+        plan = WritePlan()
+        touch_system, _ = self._plan_remove_quick_mode_or_holiday(plan, entity)
 
         if isinstance(mode, QuickMode):
-            await self._hard_set_quick_mode(mode)
-            self._quick_mode = mode
+            plan.then()
+            plan.add("set quick mode", partial(self._hard_set_quick_mode, mode))
             touch_system = True
-        else:
-            await self._manager.set_ventilation_operating_mode(
-                entity.component.id, mode
+        elif ventilation.operating_mode != mode:
+            plan.add(
+                "set ventilation operating mode",
+                partial(
+                    self._manager.set_ventilation_operating_mode, ventilation.id, mode
+                ),
             )
-            entity.component.operating_mode = mode
+        await plan.async_execute()
+
+        if isinstance(mode, QuickMode):
+            self._quick_mode = mode
+        else:
+            ventilation.operating_mode = mode
         await self._refresh(touch_system, entity)
 
+    async def apply_state(
+        self, targets: list[tuple[Any, Mode | None, float | None]]
+    ) -> dict[str, str | None]:
+        """Apply operating modes and target temperatures to many entities.
+
+        System wide modes are removed once for all the components, then
+        writes run concurrently (bounded by the configured concurrency) and
+        entities are refreshed once at the end. Return the error of each
+        entity id, `None` means success.
+        """
+        results: dict[str, str | None] = {}
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        # Pending coalesced values of the targets would overwrite the new ones
+        await asyncio.gather(
+            *(
+                self._coalescer.async_supersede(
+                    entity,
+                    [
+                        operation
+                        for operation, value in (
+                            (WRITE_MODE, mode),
+                            (WRITE_TEMPERATURE, temperature),
+                        )
+                        if value is not None
+                    ],
+                )
+                for entity, mode, temperature in targets
+            )
+        )
+
+        async def apply(entity, mode, temperature):
+            setters = _STATE_SETTERS.get(type(entity.component))
+            if setters is None:
+                results[entity.entity_id] = "unsupported component"
+                return
+            set_mode, set_temperature = setters
+            if temperature is not None and set_temperature is None:
+                results[entity.entity_id] = "temperature is not supported"
+                return
+            async with semaphore:
+                try:
+                    if mode is not None:
+                        await getattr(self, set_mode)(entity, mode)
+                    if temperature is not None:
+                        await getattr(self, set_temperature)(entity, temperature)
+                except (ApiError, asyncio.TimeoutError, ClientError) as err:
+                    _LOGGER.warning("Cannot apply state to %s", entity.entity_id)
+                    results[entity.entity_id] = _describe_error(err)
+                else:
+                    results[entity.entity_id] = None
+
+        plan = WritePlan()
+        touch_system, _, _ = self._plan_remove_system_modes(
+            plan, [entity.component for entity, _, _ in targets]
+        )
+        self._batch = {}
+        try:
+            try:
+                await plan.async_execute()
+            except (ApiError, asyncio.TimeoutError, ClientError) as err:
+                # No target can be applied while system wide modes are there
+                _LOGGER.warning("Cannot remove holiday mode or quick mode")
+                error = _describe_error(err)
+                for entity, _, _ in targets:
+                    results[entity.entity_id] = error
+            else:
+                await asyncio.gather(*(apply(*target) for target in targets))
+        finally:
+            batch, self._batch = self._batch, None
+            self.invalidate_active_modes()
+            if touch_system or any(batch.values()):
+                await self._refresh_entities()
+            for entity in batch:
+                self._publish(entity)
+        return results
+
     async def set_fan_day_level(self, entity, level):
         """Set fan day level."""
         await self._manager.set_ventilation_day_level(entity.component.id, level)
@@ -412,8 +921,8 @@ class MultimaticApi:
         removed = False
 
         qmode = self._quick_mode
-        if entity and qmode:
-            if qmode.is_for(entity.component):
+        if entity:
+            if qmode and qmode.is_for(entity.component):
                 await self._hard_remove_quick_mode()
                 removed = True
         else:  # coming from service call
@@ -445,6 +954,8 @@ class MultimaticApi:
             new_mode = QuickModes.get(mode, new_duration)
 
         await self._manager.set_quick_mode(new_mode)
+        if duration := quick_mode_duration(new_mode):
+            self.expiry.register_quick_mode(new_mode, duration)
         return new_mode
 
     async def _remove_holiday_mode_no_refresh(self):
@@ -452,24 +963,100 @@ class MultimaticApi:
         self._holiday_mode = HolidayMode(False)
         return True
 
-    async def _remove_quick_mode_or_holiday(self, entity):
-        return (
-            await self._remove_holiday_mode_no_refresh()
-            | await self._remove_quick_mode_no_refresh(entity)
+    def _plan_remove_system_modes(
+        self, plan: WritePlan, components: list[Component]
+    ) -> tuple[bool, HolidayMode | None, QuickMode | None]:
+        """Plan removal of the holiday mode and quick mode impacting components.
+
+        Return whether system modes are touched and the holiday mode and quick
+        mode once the plan is executed.
+        """
+        holiday = self._holiday_mode
+        quick_mode = self._quick_mode
+        touch_system = False
+
+        # Holiday mode is removed when unknown, it may be applied
+        if holiday is None or holiday.is_applied:
+            plan.add("remove holiday mode", self._remove_holiday_mode_no_refresh)
+            holiday = HolidayMode(False)
+            touch_system = True
+        if quick_mode and any(quick_mode.is_for(comp) for comp in components):
+            plan.add("remove quick mode", self._hard_remove_quick_mode)
+            quick_mode = None
+            touch_system = True
+
+        return touch_system, holiday, quick_mode
+
+    def _plan_remove_quick_mode_or_holiday(
+        self, plan: WritePlan, entity
+    ) -> tuple[bool, ActiveMode]:
+        """Plan removal of the holiday mode and quick mode impacting the entity.
+
+        Return whether system modes are touched and the active mode of the
+        component once the plan is executed.
+        """
+        comp = entity.component
+        touch_system, holiday, quick_mode = self._plan_remove_system_modes(
+            plan, [comp]
+        )
+        return touch_system, multimatic_utils.active_mode_for(
+            comp, holiday, quick_mode
         )
 
     async def _refresh_entities(self):
-        """Fetch multimatic data and force refresh of all listening entities."""
-        data = {
-            QUICK_MODE: quick_mode_to_json(self._quick_mode),
-            HOLIDAY_MODE: holiday_mode_to_json(self._holiday_mode),
-        }
-        self._hass.bus.async_fire(REFRESH_EVENT, data)
+        self.async_push_system_modes()
+
+    @callback
+    def async_push_system_modes(self) -> None:
+        """Push system wide modes to the coordinators of this system only."""
+        async_dispatcher_send(
+            self._hass, self.refresh_signal, self._quick_mode, self._holiday_mode
+        )
+
+    @callback
+    def async_expire_quick_mode(self) -> None:
+        """Remove the quick mode locally, it has ended."""
+        self._quick_mode = None
+        self.async_push_system_modes()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the timers and the pending writes of the system."""
+        self.expiry.async_stop()
+        self._coalescer.async_shutdown()
 
     async def _refresh(self, touch_system, entity):
+        if self._batch is not None:
+            self._batch[entity] = self._batch.get(entity, False) or touch_system
+            return
+        self.invalidate_active_modes()
         if touch_system:
             await self._refresh_entities()
-        entity.async_schedule_update_ha_state(True)
+        self._publish(entity)
+
+    @callback
+    def _publish(self, entity) -> None:
+        """Show the written state right away, it's confirmed by reading it again."""
+        entity.coordinator.async_boost()
+        # A veto set from here expires locally even if the next read lags
+        entity.coordinator.async_track_expiries()
+        entity.async_write_ha_state()
+        entity.coordinator.async_confirm(entity)
+
+
+def _describe_error(err: Exception) -> str:
+    """Describe an error of the API for a service result."""
+    if isinstance(err, ApiError):
+        return f"{err.message} (status: {err.status})"
+    return repr(err)
+
+
+_STATE_SETTERS: dict[type, tuple[str, str | None]] = {
+    HotWater: ("_set_hot_water_operating_mode", "_set_hot_water_target_temperature"),
+    Room: ("_set_room_operating_mode", "_set_room_target_temperature"),
+    Zone: ("_set_zone_operating_mode", "_set_zone_target_temperature"),
+    Ventilation: ("_set_fan_operating_mode", None),
+}
 
 
 class MultimaticCoordinator(DataUpdateCoordinator):
@@ -480,14 +1067,45 @@ class MultimaticCoordinator(DataUpdateCoordinator):
         hass,
         name,
         api: MultimaticApi,
-        method: str,
+        key: str,
         update_interval: timedelta | None,
+        cache: SnapshotCache | None = None,
+        adaptive: AdaptiveInterval | None = None,
+        untracked_interval: timedelta | None = None,
     ):
-        """Init."""
+        """Init.
+
+        `untracked_interval` is used while a quick mode whose end isn't known
+        locally is active.
+        """
 
-        self._api_listeners: set = set()
-        self._method = method
+        # Unique id of the listening entities, with the key of the data they use
+        self._api_listeners: dict[str, Any] = {}
+        self.key = key
+        self._method = "get_" + key
         self.api: MultimaticApi = api
+        self._cache = cache
+        self._index = SystemIndex(None)
+        self._fingerprints: dict[Any, int] = {}
+        self._notified_success = False
+        self._notified_stale = False
+        self.changed: set | None = None
+        self.stale = False
+        self.adaptive = adaptive
+        self._interval = update_interval
+        self._untracked_interval = untracked_interval
+        self._first_deadline: float | None = FIRST_FETCH_DEADLINE
+        self._fetched_fingerprint: int | None = None
+        self.breaker = CircuitBreaker(name, ENDPOINT_THRESHOLD)
+        self._confirmations: dict[str, CALLBACK_TYPE] = {}
+        self._boost_end: CALLBACK_TYPE | None = None
+        # Entities are updated when time programs switch, without waiting next poll
+        self.switch_points = SwitchPointTracker(
+            hass,
+            api.time_programs,
+            self.async_update_listeners,
+            self.async_request_refresh,
+        )
 
         super().__init__(
             hass,
@@ -497,63 +1115,322 @@ class MultimaticCoordinator(DataUpdateCoordinator):
             update_method=self._first_fetch_data,
         )
 
-        self._remove_listener = self.hass.bus.async_listen(
-            REFRESH_EVENT, self._handle_event
+        self._remove_listener = async_dispatcher_connect(
+            hass, api.refresh_signal, self._handle_refresh
         )
 
+    @property
+    def index(self) -> SystemIndex:
+        """Return the index of the current data, built once per update."""
+        if self._index.data is not self.data:
+            self._index = SystemIndex(self.data)
+        return self._index
+
     def find_component(
-        self, comp_id
+        self, comp_type: type, comp_id
     ) -> Room | Zone | Ventilation | HotWater | Circulation | None:
-        """Find component by its id."""
-        for comp in self.data:
-            if comp.id == comp_id:
-                return comp
-        return None
+        """Find component by its type and its id."""
+        return self.index.components.get((comp_type, comp_id))
+
+    def _compute_fingerprints(self) -> dict[Any, int]:
+        """Compute a fingerprint of each item (component, report) of the data."""
+        index = self.index
+        items = [
+            *((comp.id, comp) for comp in index.functions),
+            *index.reports.items(),
+            *index.emf_reports.items(),
+        ]
+        if not items:
+            return {None: hash(repr(self.data))}
+        subscribed = self.subscribed_keys
+        fingerprints: dict[Any, int] = {}
+        for key, item in items:
+            if subscribed is not None and key not in subscribed:
+                # Items no entity uses are not compared
+                continue
+            fingerprints[key] = hash(
+                (
+                    fingerprints.get(key),
+                    repr(item),
+                    repr(self.api.get_active_mode(item))
+                    if isinstance(item, Component)
+                    else None,
+                )
+            )
+        return fingerprints
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners, only if something has changed.
+
+        `changed` holds the keys of the items which have changed, `None` means
+        everything must be updated.
+        """
+        self.api.invalidate_active_modes()
+
+        if not self.last_update_success:
+            self._fingerprints = {}
+            self._notified_success = False
+            self.changed = None
+            super().async_update_listeners()
+            return
+
+        self.switch_points.async_update(self.index.functions)
+        self.async_track_expiries()
+
+        fingerprints = self._compute_fingerprints()
+        changed = {
+            key
+            for key in fingerprints.keys() | self._fingerprints.keys()
+            if fingerprints.get(key) != self._fingerprints.get(key)
+        }
+        self._fingerprints = fingerprints
+
+        if self._notified_success and self._notified_stale == self.stale:
+            if not changed:
+                self.logger.debug("Nothing has changed for %s", self.name)
+                return
+            self.changed = changed
+        else:
+            self.changed = None
+
+        self._notified_success = True
+        self._notified_stale = self.stale
+        super().async_update_listeners()
+
+    @callback
+    def async_seed(self, data) -> None:
+        """Set cached data, it's considered stale until the next fetch."""
+        self.stale = True
+        self.async_set_updated_data(data)
 
     def remove_api_listener(self, unique_id: str):
         """Remove entity from listening to the api."""
         if unique_id in self._api_listeners:
             self.logger.debug("Removing %s from %s", unique_id, self._method)
-            self._api_listeners.remove(unique_id)
+            del self._api_listeners[unique_id]
 
-    def add_api_listener(self, unique_id: str):
-        """Make an entity listen to API."""
+    def add_api_listener(self, unique_id: str, data_key: Any = None):
+        """Make an entity listen to API, `data_key` is the data the entity uses."""
         if unique_id not in self._api_listeners:
             self.logger.debug("Adding %s to key %s", unique_id, self._method)
-            self._api_listeners.add(unique_id)
-
-    async def _handle_event(self, event):
-        if isinstance(self.data, QuickMode):
-            quick_mode = quick_mode_from_json(event.data.get(QUICK_MODE))
+        self._api_listeners[unique_id] = data_key
+
+    @property
+    def subscribed_keys(self) -> set | None:
+        """Return the keys of the data used by entities, `None` means everything."""
+        keys = set(self._api_listeners.values())
+        if not keys or None in keys:
+            return None
+        return keys
+
+    @callback
+    def _handle_refresh(
+        self, quick_mode: QuickMode | None, holiday_mode: HolidayMode | None
+    ) -> None:
+        if self.key == QUICK_MODE:
+            self._apply_interval(quick_mode)
             self.async_set_updated_data(quick_mode)
-        elif isinstance(self.data, HolidayMode):
-            holiday_mode = holiday_mode_from_json(event.data.get(HOLIDAY_MODE))
+        elif self.key == HOLIDAY_MODE:
             self.async_set_updated_data(holiday_mode)
         else:
             self.async_set_updated_data(
                 self.data
             )  # Fake refresh for climates and water heater and fan
 
+    @callback
+    def async_stop(self) -> None:
+        """Stop listening to system refresh."""
+        self._remove_listener()
+        self.switch_points.async_stop()
+        for unsub in self._confirmations.values():
+            unsub()
+        self._confirmations = {}
+        if self._boost_end:
+            self._boost_end()
+            self._boost_end = None
+
+    @callback
+    def async_confirm(self, entity) -> None:
+        """Read the component of the entity again once the write has settled.
+
+        Successive writes to the same entity are confirmed by a single read.
+        """
+        if unsub := self._confirmations.pop(entity.entity_id, None):
+            unsub()
+        self._confirmations[entity.entity_id] = async_call_later(
+            self.hass, CONFIRM_DELAY, partial(self._async_confirm, entity)
+        )
+
+    async def _async_confirm(self, entity, now: datetime) -> None:
+        self._confirmations.pop(entity.entity_id, None)
+        comp = entity.component
+        if comp is None:
+            return
+        try:
+            confirmed = await self.api.fetch_component(comp)
+        except (ApiError, asyncio.TimeoutError, ClientError) as err:
+            self.logger.debug("Cannot confirm %s, next poll will", comp.id, exc_info=err)
+            return
+        if confirmed is None:
+            return
+        if repr(confirmed) != repr(comp):
+            self.logger.debug("%s is not as written, rolling back", comp.id)
+        # Keeps polling schedule, other items of the data haven't been read
+        self.data = self._replace_component(comp, confirmed)
+        if self._cache:
+            self._cache.async_update(self.key, self.data)
+        self.async_update_listeners()
+
+    def _replace_component(self, comp: Component, confirmed: Component):
+        data = self.data
+        if isinstance(data, list):
+            return [confirmed if item is comp else item for item in data]
+        if isinstance(data, Dhw):
+            if data.hotwater is comp:
+                return attr.evolve(data, hotwater=confirmed)
+            return data
+        return confirmed if data is comp else data
+
     async def _fetch_data(self):
+        breakers = (self.breaker, self.api.account.breaker)
+        if any(breaker.blocked for breaker in breakers):
+            return self._stale_data()
+        for breaker in breakers:
+            breaker.allow()
         try:
             self.logger.debug("calling %s", self._method)
-            return await getattr(self.api, self._method)()
+            result = await self.api.fetch(self.key, self.subscribed_keys)
+            for breaker in breakers:
+                breaker.record_success()
+            self.stale = False
+            self._adapt_interval(result)
+            if self._cache and result is not None:
+                self._cache.async_update(self.key, result)
+            return result
         except ApiError as err:
             if err.status == 401:
-                await self._safe_logout()
-            raise
+                self.logger.warning("Cannot authenticate to the API: %s", err.message)
+            if not is_transient(err):
+                raise
+            return self._handle_transient_error(breakers, err)
+        except (asyncio.TimeoutError, ClientError) as err:
+            return self._handle_transient_error(breakers, err)
+
+    def _handle_transient_error(self, breakers, err: Exception):
+        for breaker in breakers:
+            breaker.record_failure(err)
+        if self.data is None:
+            raise err
+        self.logger.debug("Cannot get %s, keeping last data", self.key, exc_info=err)
+        return self._stale_data()
+
+    def _stale_data(self):
+        """Serve the last good data while the API is failing."""
+        if self.data is None:
+            raise UpdateFailed(f"API is unavailable, cannot get {self.key}")
+        self.stale = True
+        return self.data
+
+    def _adapt_interval(self, result) -> None:
+        """Stretch or shrink the polling interval, depending on data changes."""
+        if self.adaptive:
+            fingerprint = hash(repr(result))
+            if self._fetched_fingerprint is not None:
+                self.adaptive.observe(fingerprint != self._fetched_fingerprint)
+            self._fetched_fingerprint = fingerprint
+        self._apply_interval(result)
+
+    def has_untracked_quick_mode(self, data: Any) -> bool:
+        """Return whether data is a quick mode whose end is only seen by polling."""
+        return (
+            self.key == QUICK_MODE
+            and data is not None
+            and not self.api.expiry.knows_end(data)
+        )
+
+    def _apply_interval(self, data: Any = None) -> None:
+        """Use the adaptive interval, stretched when the request budget runs low."""
+        if self.update_interval is None:
+            return
+        interval = self.adaptive.interval if self.adaptive else self._interval
+        if self._untracked_interval and self.has_untracked_quick_mode(data):
+            interval = min(interval, self._untracked_interval)
+        self.update_interval = interval * self.api.account.budget.poll_stretch
+        self.logger.debug("Next %s in %s", self._method, self.update_interval)
+
+    @callback
+    def async_track_expiries(self) -> None:
+        """Update entities as soon as a veto or a system mode ends."""
+        expiry = self.api.expiry
+        if self.key == QUICK_MODE:
+            expiry.async_track_quick_mode(self.data, self._handle_quick_mode_expiry)
+        elif self.key == HOLIDAY_MODE:
+            expiry.async_track_holiday_mode(self.data, self._handle_holiday_change)
+        else:
+            expiry.async_track_vetos(
+                self.key, self.index.functions, self._handle_veto_expiry
+            )
+
+    @callback
+    def _handle_quick_mode_expiry(self) -> None:
+        self.api.async_expire_quick_mode()
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _handle_holiday_change(self) -> None:
+        # Holiday mode is applied depending on the current date
+        self.api.async_push_system_modes()
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _handle_veto_expiry(self, comp_type: type, comp_id: str) -> None:
+        comp = self.find_component(comp_type, comp_id)
+        if comp is not None:
+            comp.quick_veto = None
+        self.async_update_listeners()
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def async_boost(self) -> None:
+        """Poll more often for a while, data is expected to change."""
+        if not self.adaptive:
+            return
+        self.adaptive.boost()
+        self._reschedule()
+        if self._boost_end:
+            self._boost_end()
+        self._boost_end = async_call_later(
+            self.hass, BOOST_DURATION, self._async_end_boost
+        )
+
+    @callback
+    def _async_end_boost(self, now: datetime) -> None:
+        self._boost_end = None
+        self._reschedule()
+
+    @callback
+    def _reschedule(self) -> None:
+        """Apply the current interval to the refresh already scheduled."""
+        self._apply_interval(self.data)
+        if self._unsub_refresh:
+            self._schedule_refresh()
 
     async def _fetch_data_if_needed(self):
-        if self._api_listeners and len(self._api_listeners) > 0:
+        if self._api_listeners:
             return await self._fetch_data()
 
     async def _first_fetch_data(self):
+        # A slow endpoint doesn't hold up the setup, later attempts have no deadline
+        deadline, self._first_deadline = self._first_deadline, None
         try:
-            result = await self._fetch_data()
+            result = await asyncio.wait_for(self._fetch_data(), deadline)
             self.update_method = self._fetch_data_if_needed
             return result
         except ApiError as err:
             if err.status in (400, 409):
+                # Definite answer, the system doesn't have the feature
+                self.stale = False
                 self.update_method = self._fetch_data_if_needed
                 _LOGGER.debug(
                     "Received %s %s when calling %s for the first time",
@@ -565,8 +1442,114 @@ class MultimaticCoordinator(DataUpdateCoordinator):
                 return None
             raise
 
-    async def _safe_logout(self):
-        try:
-            await self.api.logout()
-        except ApiError:
-            self.logger.debug("Error during logout", exc_info=True)
+
+@dataclass(frozen=True)
+class SystemSnapshot:
+    """State of the whole system, built from a single polling cycle.
+
+    `data` holds the payload of each coordinator key, `fetched_at` when each
+    payload was last fetched. `refreshed` and `failed` describe the cycle
+    which built the snapshot.
+    """
+
+    data: Mapping[str, Any]
+    fetched_at: Mapping[str, datetime]
+    refreshed: frozenset[str]
+    failed: Mapping[str, BaseException]
+
+
+class MultimaticSnapshotCoordinator(DataUpdateCoordinator):
+    """Fetch every coordinator key in one cycle and feed the key coordinators.
+
+    Key coordinators don't poll on their own in this mode, they only expose
+    their part of the snapshot to the entities. Without update interval, the
+    snapshot is refreshed by the poller of the account.
+    """
+
+    def __init__(
+        self,
+        hass,
+        api: MultimaticApi,
+        coordinators: dict[str, MultimaticCoordinator],
+        intervals: dict[str, timedelta | None],
+        update_interval: timedelta | None,
+    ):
+        """Init."""
+        self.api: MultimaticApi = api
+        self._coordinators = coordinators
+        self._intervals = intervals
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{MULTIMATIC}_snapshot",
+            update_interval=update_interval,
+            update_method=self._fetch_snapshot,
+        )
+
+        # Keeps the coordinator scheduled, it has no entity listening to it
+        self._remove_dispatch = self.async_add_listener(self._async_dispatch)
+
+    def _is_due(self, key: str, now: datetime) -> bool:
+        coordinator = self._coordinators[key]
+        if coordinator.has_untracked_quick_mode(coordinator.data):
+            return True
+        interval = self._intervals.get(key)
+        adaptive = coordinator.adaptive
+        if interval is None and adaptive:
+            interval = adaptive.interval
+        if interval is not None:
+            interval = interval * self.api.account.budget.poll_stretch
+        fetched_at = self.data.fetched_at.get(key) if self.data else None
+        return interval is None or fetched_at is None or now - fetched_at >= interval
+
+    async def _fetch_snapshot(self) -> SystemSnapshot:
+        now = dt_util.utcnow()
+        keys = [key for key in self._coordinators if self._is_due(key, now)]
+        self.logger.debug("Building snapshot with %s", keys)
+
+        results = await asyncio.gather(
+            *(self._coordinators[key].update_method() for key in keys),
+            return_exceptions=True,
+        )
+
+        data = dict(self.data.data) if self.data else {}
+        fetched_at = dict(self.data.fetched_at) if self.data else {}
+        failed: dict[str, BaseException] = {}
+        for key, result in zip(keys, results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, BaseException):
+                self.logger.debug("Cannot get %s", key, exc_info=result)
+                failed[key] = result
+            else:
+                data[key] = result
+                fetched_at[key] = now
+
+        if keys and len(failed) == len(keys):
+            raise UpdateFailed(f"Cannot get any of {keys}")
+
+        return SystemSnapshot(
+            data=MappingProxyType(data),
+            fetched_at=MappingProxyType(fetched_at),
+            refreshed=frozenset(keys) - failed.keys(),
+            failed=MappingProxyType(failed),
+        )
+
+    @callback
+    def _async_dispatch(self) -> None:
+        """Push the snapshot to the key coordinators."""
+        if not self.last_update_success:
+            for coord in self._coordinators.values():
+                coord.async_set_update_error(self.last_exception)
+            return
+
+        for key in self.data.refreshed:
+            self._coordinators[key].async_set_updated_data(self.data.data[key])
+        for key, err in self.data.failed.items():
+            self._coordinators[key].async_set_update_error(err)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop polling."""
+        self._remove_dispatch()
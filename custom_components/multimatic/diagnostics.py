@@ -0,0 +1,39 @@
+"""Diagnostics support for multimatic."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import ACCOUNT, API, COORDINATORS, DOMAIN
+from .utils import system_ids
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the state of the connection to the API, per system."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "account": {"breaker": data[ACCOUNT].breaker.as_dict()},
+        "systems": {
+            system_id: _system_diagnostics(hass.data[DOMAIN][system_id])
+            for system_id in system_ids(hass, entry.entry_id)
+        },
+    }
+
+
+def _system_diagnostics(data: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "serial": data[API].serial,
+        "coordinators": {
+            key: {
+                "breaker": coordinator.breaker.as_dict(),
+                "stale": coordinator.stale,
+                "last_update_success": coordinator.last_update_success,
+                "update_interval": str(coordinator.update_interval),
+            }
+            for key, coordinator in data[COORDINATORS].items()
+        },
+    }
@@ -2,12 +2,15 @@
 from __future__ import annotations
 
 from abc import ABC
+from collections.abc import Mapping
 import logging
+from typing import Any
 
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import slugify
 
-from .const import DOMAIN as MULTIMATIC
+from .const import ATTR_NEXT_CHANGE, ATTR_NEXT_TARGET, ATTR_STALE, DOMAIN as MULTIMATIC
 from .coordinator import MultimaticCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -36,18 +39,58 @@ class MultimaticEntity(CoordinatorEntity, ABC):
         """Return a unique ID."""
         return self._unique_id
 
+    @property
+    def data_key(self) -> Any:
+        """Return the key of the data (component, report) the entity relies on.
+
+        The entity is only updated when this data has changed, `None` means
+        the entity is updated every time the coordinator has new data.
+        """
+        return None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        changed = self.coordinator.changed
+        if changed is not None and self.data_key is not None:
+            if self.data_key not in changed:
+                return
+        super()._handle_coordinator_update()
+
     async def async_added_to_hass(self):
         """Call when entity is added to hass."""
         await super().async_added_to_hass()
         _LOGGER.debug("%s added", self.entity_id)
-        self.coordinator.add_api_listener(self.unique_id)
+        self.coordinator.add_api_listener(self.unique_id, self.data_key)
+        self.coordinator.api.entities[self.entity_id] = self
 
     async def async_will_remove_from_hass(self) -> None:
         """Run when entity will be removed from hass."""
         await super().async_will_remove_from_hass()
         self.coordinator.remove_api_listener(self.unique_id)
+        self.coordinator.api.entities.pop(self.entity_id, None)
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
         return super().available and self.coordinator.data
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return entity specific state attributes."""
+        if self.coordinator.stale:
+            return {ATTR_STALE: True}
+        return {}
+
+    def _next_change_attributes(self) -> dict[str, Any]:
+        """Return when the time program changes the component next, and to what."""
+        component = getattr(self, "component", None)
+        if component is None:
+            return {}
+        next_change = self.coordinator.api.get_next_change(component)
+        if next_change is None:
+            return {}
+        return {
+            ATTR_NEXT_CHANGE: next_change[0].isoformat(),
+            ATTR_NEXT_TARGET: next_change[1].target,
+        }
@@ -0,0 +1,193 @@
+"""Local expiry of quick vetos, quick mode and holiday mode."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+from typing import Any
+
+from pymultimatic.model import (
+    Component,
+    HolidayMode,
+    QuickMode,
+    QuickModes,
+    QuickVeto,
+)
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+QUICK_MODE_KEY = "quick_mode"
+HOLIDAY_MODE_KEY = "holiday_mode"
+
+# Quick modes ending by themselves after a fixed time
+FIXED_QUICK_MODE_DURATIONS = {
+    QuickModes.VENTILATION_BOOST.name: timedelta(minutes=30),
+    QuickModes.PARTY.name: timedelta(hours=6),
+    QuickModes.ONE_DAY_AWAY.name: timedelta(days=1),
+    QuickModes.ONE_DAY_AT_HOME.name: timedelta(days=1),
+}
+
+
+def quick_mode_duration(quick_mode: QuickMode) -> timedelta | None:
+    """Get how long a quick mode lasts, `None` if it isn't known."""
+    if quick_mode.duration:
+        return timedelta(days=quick_mode.duration)
+    return FIXED_QUICK_MODE_DURATIONS.get(quick_mode.name)
+
+
+class ExpiryTracker:
+    """Call back when quick vetos, quick mode or holiday mode end.
+
+    The API only gives the remaining duration of a quick veto, its end is
+    computed when the veto is first seen. Vetos set from here are registered
+    per component and their end is used at the next tracking of the component,
+    zone vetos don't always come back with a duration. Quick modes have no
+    remaining duration, their end is only known when they are set from here.
+    Holiday mode starts and ends at midnight.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Init."""
+        self._hass = hass
+        self._vetos: dict[str, dict[Any, tuple[QuickVeto, datetime | None]]] = {}
+        self._registered: dict[tuple[str, Any], datetime] = {}
+        self._timers: dict[Any, tuple[datetime, CALLBACK_TYPE]] = {}
+        self._quick_mode: QuickMode | None = None
+        self._registered_quick_mode: tuple[QuickMode, datetime] | None = None
+
+    @callback
+    def register_veto(self, key: str, comp_id: Any, duration: timedelta) -> None:
+        """Register the duration of a veto set from here on a component."""
+        self._registered[(key, comp_id)] = dt_util.utcnow() + duration
+
+    @callback
+    def register_quick_mode(self, quick_mode: QuickMode, duration: timedelta) -> None:
+        """Register the duration of a quick mode set from here."""
+        self._registered_quick_mode = (quick_mode, dt_util.utcnow() + duration)
+
+    def knows_end(self, quick_mode: QuickMode) -> bool:
+        """Return whether the end of the quick mode is tracked."""
+        registered = self._registered_quick_mode
+        return quick_mode == self._quick_mode or bool(
+            registered and registered[0] == quick_mode
+        )
+
+    @callback
+    def async_track_vetos(
+        self,
+        key: str,
+        components: Iterable[Component],
+        on_expiry: Callable[[type, Any], None],
+    ) -> None:
+        """Track the end of the quick vetos of components."""
+        previous = self._vetos.get(key, {})
+        current: dict[Any, tuple[QuickVeto, datetime | None]] = {}
+        for comp in components:
+            # A registration is used by the next tracking of its component
+            registered = self._registered.pop((key, comp.id), None)
+            veto = getattr(comp, "quick_veto", None)
+            if veto is None:
+                continue
+            known = previous.get(comp.id)
+            if registered:
+                end = registered
+            elif known and known[0] is veto:
+                end = known[1]
+            elif veto.duration:
+                end = dt_util.utcnow() + timedelta(minutes=veto.duration)
+            elif known:
+                # Zone vetos may have no duration, keep the end of the previous one
+                end = known[1]
+            else:
+                end = None
+            current[comp.id] = (veto, end)
+            self._schedule((key, comp.id), end, partial(on_expiry, type(comp), comp.id))
+
+        for comp_id in previous.keys() - current.keys():
+            self._cancel((key, comp_id))
+        self._vetos[key] = current
+
+        # Registrations of components which are not there are dropped once over
+        now = dt_util.utcnow()
+        self._registered = {
+            registered: end for registered, end in self._registered.items() if end > now
+        }
+
+    @callback
+    def async_track_quick_mode(
+        self, quick_mode: QuickMode | None, on_expiry: Callable[[], None]
+    ) -> None:
+        """Track the end of the quick mode, if it was set from here."""
+        if quick_mode is None or quick_mode != self._quick_mode:
+            # Quick mode has ended or has been changed from somewhere else
+            self._cancel(QUICK_MODE_KEY)
+            self._quick_mode = None
+        registered = self._registered_quick_mode
+        if quick_mode and registered and registered[0] == quick_mode:
+            self._registered_quick_mode = None
+            self._quick_mode = quick_mode
+            self._schedule(QUICK_MODE_KEY, registered[1], on_expiry)
+
+    @callback
+    def async_track_holiday_mode(
+        self, holiday_mode: HolidayMode | None, on_change: Callable[[], None]
+    ) -> None:
+        """Track the next start or end of the holiday mode."""
+        change = None
+        if (
+            holiday_mode
+            and holiday_mode.is_active
+            and holiday_mode.start_date
+            and holiday_mode.end_date
+        ):
+            today = dt_util.now().date()
+            if today < holiday_mode.start_date:
+                change = dt_util.start_of_local_day(holiday_mode.start_date)
+            elif today <= holiday_mode.end_date:
+                change = dt_util.start_of_local_day(
+                    holiday_mode.end_date + timedelta(days=1)
+                )
+        self._schedule(HOLIDAY_MODE_KEY, change, on_change)
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel all the timers."""
+        for key in list(self._timers):
+            self._cancel(key)
+        self._registered = {}
+        self._registered_quick_mode = None
+
+    @callback
+    def _schedule(
+        self, key: Any, when: datetime | None, action: Callable[[], None]
+    ) -> None:
+        current = self._timers.get(key)
+        if current and current[0] == when:
+            return
+        self._cancel(key)
+        if when is None:
+            return
+        _LOGGER.debug("%s ends at %s", key, when)
+        self._timers[key] = (
+            when,
+            async_track_point_in_time(
+                self._hass, partial(self._handle_expiry, key, action), when
+            ),
+        )
+
+    @callback
+    def _cancel(self, key: Any) -> None:
+        if current := self._timers.pop(key, None):
+            current[1]()
+
+    @callback
+    def _handle_expiry(
+        self, key: Any, action: Callable[[], None], now: datetime
+    ) -> None:
+        self._timers.pop(key, None)
+        action()
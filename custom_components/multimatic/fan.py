@@ -10,11 +10,11 @@ from pymultimatic.model import OperatingModes, QuickModes
 
 from homeassistant.components.fan import DOMAIN, FanEntity, FanEntityFeature
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import ATTR_LEVEL, VENTILATION
+from .const import ATTR_LEVEL, VENTILATION, WRITE_MODE
 from .coordinator import MultimaticCoordinator
 from .entities import MultimaticEntity
 from .service import (
@@ -22,7 +22,7 @@ from .service import (
     SERVICE_SET_VENTILATION_NIGHT_LEVEL,
     SERVICES,
 )
-from .utils import get_coordinator
+from .utils import async_setup_systems, get_coordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,24 +32,30 @@ async def async_setup_entry(
 ) -> None:
     """Set up the multimatic fan platform."""
 
-    coordinator = get_coordinator(hass, VENTILATION, entry.entry_id)
+    # Systems set up later are out of the context of the platform setup
+    platform = entity_platform.async_get_current_platform()
 
-    if coordinator.data:
-        _LOGGER.debug("Adding fan entity")
-        async_add_entities([MultimaticFan(coordinator)])
+    @callback
+    def async_setup_system(system_id: str) -> None:
+        coordinator = get_coordinator(hass, VENTILATION, system_id)
 
-        _LOGGER.debug("Adding fan services")
-        platform = entity_platform.async_get_current_platform()
-        platform.async_register_entity_service(
-            SERVICE_SET_VENTILATION_DAY_LEVEL,
-            SERVICES[SERVICE_SET_VENTILATION_DAY_LEVEL]["schema"],
-            SERVICE_SET_VENTILATION_DAY_LEVEL,
-        )
-        platform.async_register_entity_service(
-            SERVICE_SET_VENTILATION_NIGHT_LEVEL,
-            SERVICES[SERVICE_SET_VENTILATION_NIGHT_LEVEL]["schema"],
-            SERVICE_SET_VENTILATION_NIGHT_LEVEL,
-        )
+        if coordinator and coordinator.data:
+            _LOGGER.debug("Adding fan entity")
+            async_add_entities([MultimaticFan(coordinator)])
+
+            _LOGGER.debug("Adding fan services")
+            platform.async_register_entity_service(
+                SERVICE_SET_VENTILATION_DAY_LEVEL,
+                SERVICES[SERVICE_SET_VENTILATION_DAY_LEVEL]["schema"],
+                SERVICE_SET_VENTILATION_DAY_LEVEL,
+            )
+            platform.async_register_entity_service(
+                SERVICE_SET_VENTILATION_NIGHT_LEVEL,
+                SERVICES[SERVICE_SET_VENTILATION_NIGHT_LEVEL]["schema"],
+                SERVICE_SET_VENTILATION_NIGHT_LEVEL,
+            )
+
+    async_setup_systems(hass, entry, async_setup_system)
 
 
 class MultimaticFan(MultimaticEntity, FanEntity):
@@ -64,12 +70,18 @@ class MultimaticFan(MultimaticEntity, FanEntity):
             coordinator.data.id,
         )
 
+        self._ventilation_id = coordinator.data.id
         self._preset_modes = [
             OperatingModes.AUTO.name,
             OperatingModes.DAY.name,
             OperatingModes.NIGHT.name,
         ]
 
+    @property
+    def data_key(self) -> str:
+        """Return the key of the data the entity relies on."""
+        return self._ventilation_id
+
     @property
     def component(self):
         """Return the ventilation."""
@@ -118,7 +130,8 @@ class MultimaticFan(MultimaticEntity, FanEntity):
     @property
     def preset_mode(self) -> str | None:
         """Return the current preset mode, e.g., auto, smart, interval, favorite."""
-        return self.active_mode.current.name
+        pending = self.coordinator.api.pending_write(self, WRITE_MODE)
+        return (pending or self.active_mode.current).name
 
     @property
     def preset_modes(self) -> list[str] | None:
@@ -151,4 +164,4 @@ class MultimaticFan(MultimaticEntity, FanEntity):
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """Return entity specific state attributes."""
-        return {"speed": self.active_mode.target}
+        return {**super().extra_state_attributes, "speed": self.active_mode.target}
@@ -0,0 +1,82 @@
+"""Fleet of systems managed from a single account entry."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import logging
+import zlib
+
+from aiohttp import ClientError
+from pymultimatic.api import ApiError
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
+
+from .account import Account, account_id
+from .cache import SnapshotCache
+from .const import (
+    CONF_APPLICATION,
+    CONF_CAPABILITIES,
+    CONF_FLEET,
+    CONF_SERIAL_NUMBER,
+    CONF_SYSTEMS,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def system_phase(serial: str, interval: timedelta) -> timedelta:
+    """Get the offset of a system within the interval, stable across restarts."""
+    return interval * ((zlib.crc32(serial.encode()) % 1000) / 1000)
+
+
+def fleet_system_id(entry_id: str, serial: str) -> str:
+    """Get the id of a system of a fleet entry."""
+    return f"{entry_id}_{serial}"
+
+
+async def async_list_fleet(
+    hass: HomeAssistant, entry: ConfigEntry, account: Account
+) -> dict[str, str]:
+    """Get the systems of the fleet, serial number with name.
+
+    Systems having their own entry are left to it. Systems are kept in the
+    entry, data of the systems which are gone is removed.
+    """
+    try:
+        listed = await account.async_list_systems()
+    except (ApiError, asyncio.TimeoutError, ClientError) as err:
+        raise ConfigEntryNotReady(f"Cannot list the systems: {err!r}") from err
+
+    configured = {
+        other.data.get(CONF_SERIAL_NUMBER)
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if not other.data.get(CONF_FLEET)
+        and account_id(other.data[CONF_USERNAME], other.data[CONF_APPLICATION])
+        == account.id
+    }
+    systems = {
+        serial: name for serial, name in listed.items() if serial not in configured
+    }
+
+    known = entry.data.get(CONF_SYSTEMS, {})
+    _LOGGER.debug("Fleet has %s systems, was %s", len(systems), len(known))
+    if systems == known:
+        return systems
+
+    for serial in set(known) - set(systems):
+        system_id = fleet_system_id(entry.entry_id, serial)
+        await SnapshotCache(hass, system_id).async_remove()
+    capabilities = {
+        serial: probed
+        for serial, probed in entry.data.get(CONF_CAPABILITIES, {}).items()
+        if serial in systems
+    }
+    hass.config_entries.async_update_entry(
+        entry,
+        data={**entry.data, CONF_SYSTEMS: systems, CONF_CAPABILITIES: capabilities},
+    )
+    return systems
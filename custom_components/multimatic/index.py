@@ -0,0 +1,51 @@
+"""Index of coordinator data, for fast lookups from entities."""
+from __future__ import annotations
+
+from typing import Any
+
+from pymultimatic.model import Component, Device, Dhw, EmfReport, Report, Room
+
+
+def emf_report_key(report: EmfReport) -> str:
+    """Get the key identifying an emf report."""
+    return f"{report.device_id}_{report.function}_{report.energyType}"
+
+
+class SystemIndex:
+    """Lookup tables of the data of a coordinator.
+
+    Built once per update, entities can then get their component, report or
+    device without scanning the whole data.
+    """
+
+    def __init__(self, data: Any) -> None:
+        """Init."""
+        self.data = data
+        # Hot water and circulation share the same id, components are also
+        # keyed by their type
+        self.components: dict[tuple[type, str], Component] = {}
+        self.functions: list[Component] = []
+        self.reports: dict[tuple[str | None, str], Report] = {}
+        self.emf_reports: dict[str, EmfReport] = {}
+        self.devices: dict[str, Device] = {}
+        self.device_rooms: dict[str, Room] = {}
+
+        if isinstance(data, list):
+            items = data
+        elif isinstance(data, Dhw):
+            items = [data.hotwater, data.circulation]
+        else:
+            items = [data]
+
+        for item in items:
+            if isinstance(item, Report):
+                self.reports[(item.device_id, item.id)] = item
+            elif isinstance(item, EmfReport):
+                self.emf_reports[emf_report_key(item)] = item
+            elif isinstance(item, Component):
+                self.components[(type(item), item.id)] = item
+                self.functions.append(item)
+                if isinstance(item, Room):
+                    for device in item.devices or []:
+                        self.devices[device.sgtin] = device
+                        self.device_rooms[device.sgtin] = item
@@ -0,0 +1,46 @@
+"""Polling intervals adapted to how often data changes."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+# Interval is stretched when data didn't change, shrunk when it changed
+STRETCH_FACTOR = 1.5
+SHRINK_FACTOR = 2
+BOOST_DURATION = timedelta(minutes=10)
+
+
+class AdaptiveInterval:
+    """Polling interval of an endpoint, between a minimum and a maximum.
+
+    Each fetch returning the same data as the previous one stretches the
+    interval, a change shrinks it. After a write, the minimum interval is used
+    for a while, to get the result of the write quickly.
+    """
+
+    def __init__(self, minimum: timedelta, maximum: timedelta) -> None:
+        """Init."""
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self._interval = minimum
+        self._boost_until: datetime | None = None
+
+    @property
+    def interval(self) -> timedelta:
+        """Return the interval to use for the next fetch."""
+        if self._boost_until and dt_util.utcnow() < self._boost_until:
+            return self.minimum
+        return self._interval
+
+    def observe(self, changed: bool) -> None:
+        """Adapt the interval to the result of a fetch."""
+        if changed:
+            self._interval = max(self._interval / SHRINK_FACTOR, self.minimum)
+        else:
+            self._interval = min(self._interval * STRETCH_FACTOR, self.maximum)
+
+    def boost(self) -> None:
+        """Use the minimum interval for a while."""
+        self._boost_until = dt_util.utcnow() + BOOST_DURATION
+        self._interval = self.minimum
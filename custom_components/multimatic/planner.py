@@ -0,0 +1,43 @@
+"""Planning of the API calls needed to apply a change."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WritePlan:
+    """Ordered steps of API calls.
+
+    Calls of the same step don't depend on each other and are run
+    concurrently, steps are run one after the other. Only calls that are
+    actually needed should be added, so an empty plan does nothing.
+    """
+
+    def __init__(self) -> None:
+        """Init."""
+        self._steps: list[list[tuple[str, Callable[[], Awaitable[Any]]]]] = [[]]
+
+    def add(self, description: str, call: Callable[[], Awaitable[Any]]) -> None:
+        """Add a call to the current step."""
+        self._steps[-1].append((description, call))
+
+    def then(self) -> WritePlan:
+        """Start a new step, following calls wait for the previous ones."""
+        if self._steps[-1]:
+            self._steps.append([])
+        return self
+
+    async def async_execute(self) -> None:
+        """Run the calls, step by step."""
+        for step in self._steps:
+            if not step:
+                continue
+            _LOGGER.debug("Will %s", ", ".join(desc for desc, _ in step))
+            if len(step) == 1:
+                await step[0][1]()
+            else:
+                await asyncio.gather(*(call() for _, call in step))
@@ -0,0 +1,117 @@
+"""Polling of the systems of an account from a single timer."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from functools import partial
+import heapq
+import itertools
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AccountPoller:
+    """Poll the systems of an account, each one at its own phase.
+
+    A single timer is used whatever the number of systems, it fires when the
+    next system is due. Each system is polled at its interval, shifted by its
+    phase, so polls are spread over the interval. A system whose previous poll
+    is still running skips its turn, a removed system has its poll cancelled.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Init."""
+        self._hass = hass
+        self._systems: dict[
+            str, tuple[int, timedelta, Callable[[], Awaitable[None]]]
+        ] = {}
+        self._due: list[tuple[datetime, int, str]] = []
+        self._tokens = itertools.count()
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._timer: tuple[datetime, CALLBACK_TYPE] | None = None
+
+    @callback
+    def async_add(
+        self,
+        system_id: str,
+        interval: timedelta,
+        phase: timedelta,
+        poll: Callable[[], Awaitable[None]],
+    ) -> None:
+        """Poll a system every interval, the first time after its phase."""
+        token = next(self._tokens)
+        self._systems[system_id] = (token, interval, poll)
+        heapq.heappush(self._due, (dt_util.utcnow() + phase, token, system_id))
+        self._schedule()
+
+    @callback
+    def async_remove(self, system_id: str) -> None:
+        """Stop polling a system."""
+        # Its turns are dropped when they come up
+        self._systems.pop(system_id, None)
+        if task := self._tasks.pop(system_id, None):
+            task.cancel()
+        self._schedule()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop polling every system."""
+        self._systems = {}
+        self._due = []
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks = {}
+        self._schedule()
+
+    def _is_current(self, token: int, system_id: str) -> bool:
+        system = self._systems.get(system_id)
+        return system is not None and system[0] == token
+
+    @callback
+    def _schedule(self) -> None:
+        while self._due and not self._is_current(self._due[0][1], self._due[0][2]):
+            heapq.heappop(self._due)
+        when = self._due[0][0] if self._due else None
+        if self._timer and self._timer[0] == when:
+            return
+        if self._timer:
+            self._timer[1]()
+            self._timer = None
+        if when is not None:
+            self._timer = (
+                when,
+                async_track_point_in_utc_time(self._hass, self._handle_timer, when),
+            )
+
+    @callback
+    def _handle_timer(self, now: datetime) -> None:
+        self._timer = None
+        while self._due and self._due[0][0] <= now:
+            when, token, system_id = heapq.heappop(self._due)
+            if not self._is_current(token, system_id):
+                continue
+            _, interval, poll = self._systems[system_id]
+            # Keeps the phase of the system, unless it's late
+            next_when = when + interval
+            if next_when <= now:
+                next_when = now + interval
+            heapq.heappush(self._due, (next_when, token, system_id))
+            if system_id in self._tasks:
+                _LOGGER.debug("Previous poll of %s is still running", system_id)
+                continue
+            task = self._hass.async_create_task(poll())
+            self._tasks[system_id] = task
+            task.add_done_callback(partial(self._async_poll_done, system_id))
+        self._schedule()
+
+    @callback
+    def _async_poll_done(self, system_id: str, task: asyncio.Task) -> None:
+        # A removed then added again system may already poll again
+        if self._tasks.get(system_id) is task:
+            del self._tasks[system_id]
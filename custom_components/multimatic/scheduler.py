@@ -0,0 +1,138 @@
+"""Scheduling of the requests sent to the API, by priority, and their timeout."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+import heapq
+import itertools
+
+# Priority classes, lowest goes first
+PRIORITY_WRITE = 0
+PRIORITY_CONFIRM = 1
+PRIORITY_POLL = 2
+PRIORITY_METADATA = 3
+
+# Background classes leave room for writes, which never wait behind polls
+CLASS_LIMITS = {
+    PRIORITY_WRITE: 4,
+    PRIORITY_CONFIRM: 3,
+    PRIORITY_POLL: 5,
+    PRIORITY_METADATA: 1,
+}
+
+_PRIORITY: ContextVar[int | None] = ContextVar("multimatic_priority", default=None)
+_TIMEOUT: ContextVar[float | None] = ContextVar("multimatic_timeout", default=None)
+
+
+@contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """Send the requests done within the context (and its tasks) with a priority."""
+    token = _PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+@contextmanager
+def request_timeout(timeout: float) -> Iterator[None]:
+    """Limit the time each HTTP call done within the context can take."""
+    token = _TIMEOUT.set(timeout)
+    try:
+        yield
+    finally:
+        _TIMEOUT.reset(token)
+
+
+def current_timeout() -> float | None:
+    """Get the timeout of an HTTP call, `None` means no timeout."""
+    return _TIMEOUT.get()
+
+
+def current_priority(method: str) -> int:
+    """Get the priority of a request, reading data is polling by default."""
+    priority = _PRIORITY.get()
+    if priority is not None:
+        return priority
+    return PRIORITY_POLL if method == "get" else PRIORITY_WRITE
+
+
+class RequestScheduler:
+    """Bound concurrent requests, overall and per priority class.
+
+    Free slots go to the waiting request of the highest priority. Background
+    requests (polls and metadata) don't start while writes are running or
+    waiting.
+    """
+
+    def __init__(self, max_requests: int) -> None:
+        """Init."""
+        self.max_requests = max_requests
+        self._running = dict.fromkeys(CLASS_LIMITS, 0)
+        self._waiting = dict.fromkeys(CLASS_LIMITS, 0)
+        self._queue: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+
+    @asynccontextmanager
+    async def slot(self, priority: int) -> AsyncIterator[None]:
+        """Hold a slot for a request."""
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    def _can_start(self, priority: int) -> bool:
+        if sum(self._running.values()) >= self.max_requests:
+            return False
+        if self._running[priority] >= CLASS_LIMITS[priority]:
+            return False
+        if priority >= PRIORITY_POLL and (
+            self._running[PRIORITY_WRITE] or self._waiting[PRIORITY_WRITE]
+        ):
+            return False
+        return True
+
+    async def _acquire(self, priority: int) -> None:
+        ahead = any(self._waiting[other] for other in CLASS_LIMITS if other <= priority)
+        if not ahead and self._can_start(priority):
+            self._running[priority] += 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._counter), future))
+        self._waiting[priority] += 1
+        self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was granted meanwhile, give it to someone else
+                self._release(priority)
+            else:
+                future.cancel()
+                self._waiting[priority] -= 1
+                self._wake()
+            raise
+
+    def _release(self, priority: int) -> None:
+        self._running[priority] -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        skipped = []
+        while self._queue:
+            item = heapq.heappop(self._queue)
+            priority, _, future = item
+            if future.done():
+                continue
+            if self._can_start(priority):
+                self._waiting[priority] -= 1
+                self._running[priority] += 1
+                future.set_result(None)
+            else:
+                skipped.append(item)
+        for item in skipped:
+            heapq.heappush(self._queue, item)
@@ -14,7 +14,7 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfEnergy, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
@@ -22,7 +22,8 @@ from homeassistant.helpers.typing import StateType
 from .const import EMF_REPORTS, OUTDOOR_TEMP, REPORTS
 from .coordinator import MultimaticCoordinator
 from .entities import MultimaticEntity
-from .utils import get_coordinator
+from .index import emf_report_key
+from .utils import async_setup_systems, get_coordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,25 +39,33 @@ async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the multimatic sensors."""
-    sensors: list[MultimaticEntity] = []
-    outdoor_temp_coo = get_coordinator(hass, OUTDOOR_TEMP, entry.entry_id)
-    reports_coo = get_coordinator(hass, REPORTS, entry.entry_id)
-    emf_reports_coo = get_coordinator(hass, EMF_REPORTS, entry.entry_id)
 
-    if outdoor_temp_coo.data:
-        sensors.append(OutdoorTemperatureSensor(outdoor_temp_coo))
+    @callback
+    def async_setup_system(system_id: str) -> None:
+        sensors: list[MultimaticEntity] = []
+        outdoor_temp_coo = get_coordinator(hass, OUTDOOR_TEMP, system_id)
+        reports_coo = get_coordinator(hass, REPORTS, system_id)
+        emf_reports_coo = get_coordinator(hass, EMF_REPORTS, system_id)
 
-    if reports_coo.data:
-        sensors.extend(ReportSensor(reports_coo, report) for report in reports_coo.data)
+        if outdoor_temp_coo.data:
+            sensors.append(OutdoorTemperatureSensor(outdoor_temp_coo))
 
-    if emf_reports_coo.data:
-        sensors.extend(
-            EmfReportSensor(emf_reports_coo, report) for report in emf_reports_coo.data
-        )
+        if reports_coo.data:
+            sensors.extend(
+                ReportSensor(reports_coo, report) for report in reports_coo.data
+            )
+
+        if emf_reports_coo and emf_reports_coo.data:
+            sensors.extend(
+                EmfReportSensor(emf_reports_coo, report)
+                for report in emf_reports_coo.data
+            )
+
+        _LOGGER.info("Adding %s sensor entities", len(sensors))
 
-    _LOGGER.info("Adding %s sensor entities", len(sensors))
+        async_add_entities(sensors)
 
-    async_add_entities(sensors)
+    async_setup_systems(hass, entry, async_setup_system)
 
 
 class OutdoorTemperatureSensor(MultimaticEntity, SensorEntity):
@@ -115,17 +124,15 @@ class ReportSensor(MultimaticEntity, SensorEntity):
         self._device_name = report.device_name
         self._device_id = report.device_id
 
+    @property
+    def data_key(self) -> tuple[str, str]:
+        """Return the key of the data the entity relies on."""
+        return (self._device_id, self._report_id)
+
     @property
     def report(self):
         """Get the current report based on the id."""
-        return next(
-            (
-                report
-                for report in self.coordinator.data
-                if report.device_id == self._device_id and report.id == self._report_id
-            ),
-            None,
-        )
+        return self.coordinator.index.reports.get((self._device_id, self._report_id))
 
     @property
     def native_value(self) -> StateType:
@@ -178,22 +185,19 @@ class EmfReportSensor(MultimaticEntity, SensorEntity):
 
     def __init__(self, coordinator: MultimaticCoordinator, report: EmfReport) -> None:
         """Init entity."""
-        self._device_id = f"{report.device_id}_{report.function}_{report.energyType}"
+        self._device_id = emf_report_key(report)
         self._name = f"{report.device_name} {report.function} {report.energyType}"
         MultimaticEntity.__init__(self, coordinator, DOMAIN, self._device_id)
 
+    @property
+    def data_key(self) -> str:
+        """Return the key of the data the entity relies on."""
+        return self._device_id
+
     @property
     def report(self):
         """Get the current report based on the id."""
-        return next(
-            (
-                report
-                for report in self.coordinator.data
-                if f"{report.device_id}_{report.function}_{report.energyType}"
-                == self._device_id
-            ),
-            None,
-        )
+        return self.coordinator.index.emf_reports.get(self._device_id)
 
     @property
     def native_value(self) -> float:
@@ -2,21 +2,26 @@
 import datetime
 import logging
 
-from pymultimatic.model import QuickMode, QuickModes
+from pymultimatic.model import OperatingMode, OperatingModes, QuickMode, QuickModes
 import voluptuous as vol
 
 from homeassistant.const import ATTR_ENTITY_ID
 import homeassistant.helpers.config_validation as cv
 from homeassistant.util.dt import parse_date
 
+from .capabilities import async_clear_capabilities
 from .const import (
     ATTR_DATE_TIME,
     ATTR_DURATION,
     ATTR_END_DATE,
     ATTR_LEVEL,
+    ATTR_OPERATING_MODE,
     ATTR_QUICK_MODE,
+    ATTR_RESULTS,
     ATTR_START_DATE,
+    ATTR_TARGETS,
     ATTR_TEMPERATURE,
+    EVENT_APPLY_STATE,
 )
 from .coordinator import MultimaticApi
 
@@ -25,6 +30,9 @@ _LOGGER = logging.getLogger(__name__)
 QUICK_MODES_LIST = [
     v.name for v in QuickModes.__dict__.values() if isinstance(v, QuickMode)
 ]
+OPERATING_MODES_LIST = [
+    v.name for v in OperatingModes.__dict__.values() if isinstance(v, OperatingMode)
+]
 
 SERVICE_REMOVE_QUICK_MODE = "remove_quick_mode"
 SERVICE_REMOVE_HOLIDAY_MODE = "remove_holiday_mode"
@@ -36,9 +44,12 @@ SERVICE_REQUEST_HVAC_UPDATE = "request_hvac_update"
 SERVICE_SET_VENTILATION_DAY_LEVEL = "set_ventilation_day_level"
 SERVICE_SET_VENTILATION_NIGHT_LEVEL = "set_ventilation_night_level"
 SERVICE_SET_DATETIME = "set_datetime"
+SERVICE_APPLY_STATE = "apply_state"
+SERVICE_PROBE_CAPABILITIES = "probe_capabilities"
 
 SERVICE_REMOVE_QUICK_MODE_SCHEMA = vol.Schema({})
 SERVICE_REMOVE_HOLIDAY_MODE_SCHEMA = vol.Schema({})
+SERVICE_PROBE_CAPABILITIES_SCHEMA = vol.Schema({})
 SERVICE_REMOVE_QUICK_VETO_SCHEMA = vol.Schema(
     {vol.Required(ATTR_ENTITY_ID): vol.All(vol.Coerce(str))}
 )
@@ -87,6 +98,28 @@ SERVICE_SET_DATETIME_SCHEMA = vol.Schema(
     }
 )
 
+SERVICE_APPLY_STATE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_TARGETS): vol.All(
+            cv.ensure_list,
+            [
+                vol.All(
+                    {
+                        vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+                        vol.Optional(ATTR_OPERATING_MODE): vol.All(
+                            vol.Coerce(str), vol.In(OPERATING_MODES_LIST)
+                        ),
+                        vol.Optional(ATTR_TEMPERATURE): vol.All(
+                            vol.Coerce(float), vol.Clamp(min=5, max=70)
+                        ),
+                    },
+                    cv.has_at_least_one_key(ATTR_OPERATING_MODE, ATTR_TEMPERATURE),
+                )
+            ],
+        ),
+    }
+)
+
 SERVICES = {
     SERVICE_REMOVE_QUICK_MODE: {
         "schema": SERVICE_REMOVE_QUICK_MODE_SCHEMA,
@@ -117,6 +150,8 @@ SERVICES = {
         "entity": True,
     },
     SERVICE_SET_DATETIME: {"schema": SERVICE_SET_DATETIME_SCHEMA},
+    SERVICE_APPLY_STATE: {"schema": SERVICE_APPLY_STATE_SCHEMA},
+    SERVICE_PROBE_CAPABILITIES: {"schema": SERVICE_PROBE_CAPABILITIES_SCHEMA},
 }
 
 
@@ -161,3 +196,42 @@ class MultimaticServiceHandler:
         """Set date time."""
         date_t: datetime = call.data.get(ATTR_DATE_TIME, datetime.datetime.now())
         await self.api.set_datetime(date_t)
+
+    async def probe_capabilities(self, call):
+        """Probe the features of the system again, the integration is reloaded."""
+        entry = self._hass.config_entries.async_get_entry(self.api.entry_id)
+        async_clear_capabilities(self._hass, entry, self.api.serial)
+        await self._hass.config_entries.async_reload(entry.entry_id)
+
+    async def apply_state(self, call):
+        """Apply modes and temperatures to many entities at once.
+
+        Result of each entity is sent with a `multimatic_apply_state` event.
+        """
+        targets = []
+        results = {}
+        for target in call.data[ATTR_TARGETS]:
+            entity_id = target[ATTR_ENTITY_ID]
+            entity = self.api.entities.get(entity_id)
+            if getattr(entity, "component", None) is None:
+                results[entity_id] = "unknown entity"
+                continue
+            mode = target.get(ATTR_OPERATING_MODE)
+            targets.append(
+                (
+                    entity,
+                    OperatingModes.get(mode) if mode else None,
+                    target.get(ATTR_TEMPERATURE),
+                )
+            )
+
+        if targets:
+            results.update(await self.api.apply_state(targets))
+
+        failed = {key: error for key, error in results.items() if error}
+        if failed:
+            _LOGGER.warning("Cannot apply state to %s", failed)
+        self._hass.bus.async_fire(
+            EVENT_APPLY_STATE,
+            {ATTR_RESULTS: results, "serial": self.api.serial},
+        )
@@ -0,0 +1,245 @@
+"""Time programs of the components, evaluated locally."""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import datetime, timedelta
+import logging
+
+from pymultimatic.model import (
+    ActiveFunction,
+    ActiveMode,
+    Component,
+    OperatingModes,
+    Room,
+    SettingModes,
+    TimePeriodSetting,
+    TimeProgram,
+    Zone,
+)
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+WEEKDAYS = [
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+]
+
+# Operating modes following the time program
+TIME_PROGRAM_MODES = (OperatingModes.AUTO, OperatingModes.TIME_CONTROLLED)
+
+# Leave some time to the system to switch before confirming with the API
+SWITCH_REFRESH_DELAY = timedelta(minutes=1)
+
+
+class CompiledTimeProgram:
+    """Time program compiled to sorted start times (in minutes) per weekday."""
+
+    def __init__(self, time_program: TimeProgram | None) -> None:
+        """Init."""
+        self.starts: list[list[int]] = []
+        self.settings: list[list[TimePeriodSetting]] = []
+        days = time_program.days if time_program and time_program.days else {}
+        for weekday in WEEKDAYS:
+            tp_day = days.get(weekday)
+            settings = (
+                sorted(tp_day.settings, key=lambda s: s.absolute_minutes)
+                if tp_day and tp_day.settings
+                else []
+            )
+            self.starts.append([setting.absolute_minutes for setting in settings])
+            self.settings.append(settings)
+
+    def next_switch(self, now: datetime) -> tuple[datetime, TimePeriodSetting] | None:
+        """Get the next switch point after now, with the setting starting then."""
+        minutes = now.hour * 60 + now.minute
+        weekday = now.weekday()
+        for offset in range(len(WEEKDAYS) + 1):
+            day = (weekday + offset) % len(WEEKDAYS)
+            starts = self.starts[day]
+            idx = bisect_right(starts, minutes) if offset == 0 else 0
+            if idx < len(starts):
+                start = starts[idx]
+                switch = (now + timedelta(days=offset)).replace(
+                    hour=start // 60, minute=start % 60, second=0, microsecond=0
+                )
+                return switch, self.settings[day][idx]
+        return None
+
+    def setting_at(self, when: datetime) -> TimePeriodSetting | None:
+        """Get the setting applying at the given time."""
+        minutes = when.hour * 60 + when.minute
+        weekday = when.weekday()
+        for offset in range(len(WEEKDAYS) + 1):
+            day = (weekday - offset) % len(WEEKDAYS)
+            starts = self.starts[day]
+            idx = bisect_right(starts, minutes) if offset == 0 else len(starts)
+            if idx > 0:
+                return self.settings[day][idx - 1]
+        return None
+
+
+def followed_time_programs(comp: Component) -> list[TimeProgram]:
+    """Get the time programs the component is currently following."""
+    functions = [comp, getattr(comp, "heating", None), getattr(comp, "cooling", None)]
+    return [
+        function.time_program
+        for function in functions
+        if getattr(function, "time_program", None)
+        and getattr(function, "operating_mode", None) in TIME_PROGRAM_MODES
+    ]
+
+
+def time_program_function(comp: Component):
+    """Get the function whose time program drives the active mode of a component."""
+    if isinstance(comp, Zone):
+        if comp.active_function == ActiveFunction.COOLING and comp.cooling:
+            return comp.cooling
+        if comp.active_function == ActiveFunction.HEATING and comp.heating:
+            return comp.heating
+        return comp.heating or comp.cooling
+    return comp
+
+
+def active_mode_for_setting(function, setting: TimePeriodSetting) -> ActiveMode:
+    """Get the active mode of a function following its time program."""
+    if isinstance(function, Room):
+        return ActiveMode(
+            setting.target_temperature, function.operating_mode, setting.setting
+        )
+    if setting.setting in (SettingModes.DAY, SettingModes.ON):
+        if function.operating_mode == OperatingModes.AUTO:
+            target = function.target_high
+        else:
+            target = setting.target_temperature
+        return ActiveMode(target, function.operating_mode, setting.setting)
+    return ActiveMode(function.target_low, function.operating_mode, setting.setting)
+
+
+class TimeProgramCompiler:
+    """Compile time programs once per data update."""
+
+    def __init__(self) -> None:
+        """Init."""
+        self._compiled: dict[int, tuple[TimeProgram, CompiledTimeProgram]] = {}
+
+    def compile(self, time_program: TimeProgram) -> CompiledTimeProgram:
+        """Get the compiled time program, compiling it if needed."""
+        cached = self._compiled.get(id(time_program))
+        if cached and cached[0] is time_program:
+            return cached[1]
+        compiled = CompiledTimeProgram(time_program)
+        self._compiled[id(time_program)] = (time_program, compiled)
+        return compiled
+
+    def clear(self) -> None:
+        """Forget compiled time programs, data has changed."""
+        self._compiled = {}
+
+    def active_mode(self, comp: Component, mode: ActiveMode) -> ActiveMode:
+        """Evaluate the time program part of an active mode at the current time."""
+        if mode.current not in TIME_PROGRAM_MODES:
+            return mode
+        function = time_program_function(comp)
+        if function is None or not function.time_program:
+            return mode
+        setting = self.compile(function.time_program).setting_at(dt_util.now())
+        return active_mode_for_setting(function, setting) if setting else mode
+
+    def next_change(self, comp: Component) -> tuple[datetime, ActiveMode] | None:
+        """Get when the active mode of the component changes next, and to what."""
+        function = time_program_function(comp)
+        if (
+            function is None
+            or not function.time_program
+            or function.operating_mode not in TIME_PROGRAM_MODES
+        ):
+            return None
+        switch = self.compile(function.time_program).next_switch(dt_util.now())
+        if switch is None:
+            return None
+        return switch[0], active_mode_for_setting(function, switch[1])
+
+
+class SwitchPointTracker:
+    """Track the next switch point of a set of components.
+
+    At the switch point, `on_switch` is called to evaluate active modes
+    locally, `refresh` is called a bit later to confirm with the API.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        compiler: TimeProgramCompiler,
+        on_switch: Callable[[], None],
+        refresh: Callable[[], Awaitable[None]],
+    ) -> None:
+        """Init."""
+        self._hass = hass
+        self._compiler = compiler
+        self._on_switch = on_switch
+        self._refresh = refresh
+        self._next: datetime | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+        self._unsub_refresh: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_update(self, components: Iterable[Component]) -> None:
+        """Track the next switch point of the components."""
+        now = dt_util.now()
+        switches = [
+            switch[0]
+            for comp in components
+            for time_program in followed_time_programs(comp)
+            if (switch := self._compiler.compile(time_program).next_switch(now))
+        ]
+        next_switch = min(switches, default=None)
+        if next_switch == self._next:
+            return
+        self._cancel_switch()
+        self._next = next_switch
+        if next_switch:
+            _LOGGER.debug("Next switch point at %s", next_switch)
+            self._unsub = async_track_point_in_time(
+                self._hass, self._handle_switch, next_switch
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop tracking."""
+        self._cancel_switch()
+        if self._unsub_refresh:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+
+    @callback
+    def _cancel_switch(self) -> None:
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        self._next = None
+
+    @callback
+    def _handle_switch(self, now: datetime) -> None:
+        self._unsub = None
+        self._next = None
+        self._on_switch()
+        if self._unsub_refresh:
+            self._unsub_refresh()
+        self._unsub_refresh = async_call_later(
+            self._hass, SWITCH_REFRESH_DELAY, self._handle_refresh
+        )
+
+    async def _handle_refresh(self, now: datetime) -> None:
+        self._unsub_refresh = None
+        await self._refresh()
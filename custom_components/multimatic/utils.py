@@ -1,42 +1,109 @@
 """Utility."""
 from __future__ import annotations
 
-from datetime import datetime
+from collections.abc import Callable
+from datetime import date, datetime
+from typing import Any
 
-from pymultimatic.model import HolidayMode, QuickMode, QuickModes
+import attr
+from pymultimatic.model import (
+    ActiveFunction,
+    BoilerStatus,
+    Circulation,
+    Device,
+    Dhw,
+    EmfReport,
+    Error,
+    FacilityDetail,
+    HolidayMode,
+    HotWater,
+    HvacStatus,
+    OperatingMode,
+    OperatingModes,
+    QuickMode,
+    QuickModes,
+    QuickVeto,
+    Report,
+    Room,
+    SettingMode,
+    SettingModes,
+    TimePeriodSetting,
+    TimeProgram,
+    TimeProgramDay,
+    Ventilation,
+    Zone,
+    ZoneCooling,
+    ZoneHeating,
+)
 
-from .const import COORDINATORS, DOMAIN as MULTIMATIC
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import (
+    COORDINATORS,
+    DOMAIN as MULTIMATIC,
+    READY,
+    SIGNAL_SYSTEM_READY,
+    SYSTEMS,
+)
 
 _DATE_FORMAT = "%Y-%m-%d"
 
+_MODEL_CLASSES = {
+    cls.__name__: cls
+    for cls in (
+        BoilerStatus,
+        Circulation,
+        Device,
+        Dhw,
+        EmfReport,
+        Error,
+        FacilityDetail,
+        HolidayMode,
+        HotWater,
+        HvacStatus,
+        QuickVeto,
+        Report,
+        Room,
+        TimePeriodSetting,
+        TimeProgram,
+        TimeProgramDay,
+        Ventilation,
+        Zone,
+        ZoneCooling,
+        ZoneHeating,
+    )
+}
 
-def get_coordinator(hass, key: str, entry_id: str | None):
-    """Get coordinator from hass data."""
-    return hass.data[MULTIMATIC][entry_id][COORDINATORS][key]
 
+def get_coordinator(hass, key: str, system_id: str | None):
+    """Get coordinator from hass data, `None` if the system doesn't have the feature."""
+    return hass.data[MULTIMATIC][system_id][COORDINATORS].get(key)
 
-def holiday_mode_to_json(holiday_mode):
-    """Convert holiday to json."""
-    if holiday_mode and holiday_mode.is_applied:
-        return {
-            "active": True,
-            "start_date": holiday_mode.start_date.strftime(_DATE_FORMAT),
-            "end_date": holiday_mode.end_date.strftime(_DATE_FORMAT),
-            "target": holiday_mode.target,
-        }
-    return None
 
+def system_ids(hass, entry_id: str) -> list[str]:
+    """Get the ids of the systems of an entry, only a fleet entry has several."""
+    return hass.data[MULTIMATIC][entry_id].get(SYSTEMS, [entry_id])
 
-def holiday_mode_from_json(str_json) -> HolidayMode:
-    """Convert json to holiday mode."""
-    if str_json:
-        return HolidayMode(
-            str_json["active"],
-            datetime.strptime(str_json["start_date"], _DATE_FORMAT).date(),
-            datetime.strptime(str_json["end_date"], _DATE_FORMAT).date(),
-            str_json["target"],
+
+@callback
+def async_setup_systems(
+    hass: HomeAssistant, entry: ConfigEntry, setup: Callable[[str], None]
+) -> None:
+    """Set up the entities of each system of the entry once its data is there.
+
+    `setup` is called with the id of the system, right away for the systems
+    having data, later for the others.
+    """
+    for system_id in system_ids(hass, entry.entry_id):
+        if hass.data[MULTIMATIC][system_id].get(READY):
+            setup(system_id)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_SYSTEM_READY.format(entry.entry_id), setup
         )
-    return HolidayMode(False)
+    )
 
 
 def quick_mode_to_json(quick_mode):
@@ -51,3 +118,59 @@ def quick_mode_from_json(str_json) -> QuickMode:
     if str_json:
         return QuickModes.get(str_json["name"], str_json["duration"])
     return None
+
+
+def model_to_json(value: Any) -> Any:
+    """Convert multimatic model (zones, rooms, reports, etc.) to json."""
+    if isinstance(value, QuickMode):
+        return {"__quick_mode__": quick_mode_to_json(value)}
+    if isinstance(value, OperatingMode):
+        return {"__operating_mode__": value.name}
+    if isinstance(value, SettingMode):
+        return {"__setting_mode__": value.name}
+    if isinstance(value, ActiveFunction):
+        return {"__active_function__": value.value}
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.strftime(_DATE_FORMAT)}
+    if isinstance(value, (list, tuple)):
+        return [model_to_json(item) for item in value]
+    if isinstance(value, dict):
+        return {key: model_to_json(item) for key, item in value.items()}
+    if attr.has(type(value)):
+        json = {"__model__": type(value).__name__}
+        for field in attr.fields(type(value)):
+            if field.init:
+                json[field.name] = model_to_json(getattr(value, field.name))
+        return json
+    return value
+
+
+def model_from_json(value: Any) -> Any:
+    """Convert json to multimatic model, see model_to_json."""
+    if isinstance(value, list):
+        return [model_from_json(item) for item in value]
+    if isinstance(value, dict):
+        if "__model__" in value:
+            return _MODEL_CLASSES[value["__model__"]](
+                **{
+                    key: model_from_json(item)
+                    for key, item in value.items()
+                    if key != "__model__"
+                }
+            )
+        if "__quick_mode__" in value:
+            return quick_mode_from_json(value["__quick_mode__"])
+        if "__operating_mode__" in value:
+            return OperatingModes.get(value["__operating_mode__"])
+        if "__setting_mode__" in value:
+            return SettingModes.get(value["__setting_mode__"])
+        if "__active_function__" in value:
+            return ActiveFunction(value["__active_function__"])
+        if "__datetime__" in value:
+            return datetime.fromisoformat(value["__datetime__"])
+        if "__date__" in value:
+            return datetime.strptime(value["__date__"], _DATE_FORMAT).date()
+        return {key: model_from_json(item) for key, item in value.items()}
+    return value
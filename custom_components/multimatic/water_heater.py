@@ -1,4 +1,7 @@
 """Interfaces with multimatic water heater."""
+from __future__ import annotations
+
+from collections.abc import Mapping
 import logging
 from typing import Any
 
@@ -12,13 +15,13 @@ from homeassistant.components.water_heater import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DHW
+from .const import DHW, WRITE_MODE, WRITE_TEMPERATURE
 from .coordinator import MultimaticCoordinator
 from .entities import MultimaticEntity
-from .utils import get_coordinator
+from .utils import async_setup_systems, get_coordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,13 +45,18 @@ async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up water_heater platform."""
-    entities = []
-    coordinator = get_coordinator(hass, DHW, entry.entry_id)
 
-    if coordinator.data and coordinator.data.hotwater:
-        entities.append(MultimaticWaterHeater(coordinator))
+    @callback
+    def async_setup_system(system_id: str) -> None:
+        entities = []
+        coordinator = get_coordinator(hass, DHW, system_id)
+
+        if coordinator.data and coordinator.data.hotwater:
+            entities.append(MultimaticWaterHeater(coordinator))
 
-    async_add_entities(entities)
+        async_add_entities(entities)
+
+    async_setup_systems(hass, entry, async_setup_system)
 
 
 class MultimaticWaterHeater(MultimaticEntity, WaterHeaterEntity):
@@ -59,12 +67,18 @@ class MultimaticWaterHeater(MultimaticEntity, WaterHeaterEntity):
         super().__init__(coordinator, DOMAIN, coordinator.data.hotwater.id)
         self._operations = {mode.name: mode for mode in HotWater.MODES}
         self._name = coordinator.data.hotwater.name
+        self._hotwater_id = coordinator.data.hotwater.id
 
     @property
     def name(self) -> str:
         """Return the name of the entity."""
         return self._name
 
+    @property
+    def data_key(self) -> str:
+        """Return the key of the data the entity relies on."""
+        return self._hotwater_id
+
     @property
     def component(self):
         """Return multimatic component."""
@@ -75,6 +89,11 @@ class MultimaticWaterHeater(MultimaticEntity, WaterHeaterEntity):
         """Return multimatic component's active mode."""
         return self.coordinator.api.get_active_mode(self.component)
 
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return entity specific state attributes."""
+        return {**super().extra_state_attributes, **self._next_change_attributes()}
+
     @property
     def supported_features(self) -> WaterHeaterEntityFeature:
         """Return the list of supported features.
@@ -114,8 +133,9 @@ class MultimaticWaterHeater(MultimaticEntity, WaterHeaterEntity):
 
     @property
     def target_temperature(self) -> float:
-        """Return the temperature we try to reach."""
-        return self.active_mode.target
+        """Return the temperature we try to reach (or about to be written)."""
+        pending = self.coordinator.api.pending_write(self, WRITE_TEMPERATURE)
+        return pending if pending is not None else self.active_mode.target
 
     @property
     def current_temperature(self) -> float:
@@ -135,7 +155,8 @@ class MultimaticWaterHeater(MultimaticEntity, WaterHeaterEntity):
     @property
     def current_operation(self) -> str:
         """Return current operation ie. eco, electric, performance, ..."""
-        return self.active_mode.current.name
+        pending = self.coordinator.api.pending_write(self, WRITE_MODE)
+        return (pending or self.active_mode.current).name
 
     @property
     def operation_list(self) -> list[str]:
@@ -0,0 +1,399 @@
+"""Measure the memory and CPU used per system of a fleet.
+
+Home Assistant runs in process with the integration, the API is replaced by
+canned responses of a typical system (one zone, hot water with circulation,
+live reports, one EMF device, no room and no ventilation). Each size runs in
+its own process, so memory isn't shared between runs.
+
+    python scripts/benchmark_fleet.py --systems 1 10 50 100
+
+`--standalone` sets up one entry per system instead of a fleet entry, to
+compare. Linux only (memory is read from /proc), needs Home Assistant and
+pymultimatic installed.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import timedelta
+import gc
+import importlib
+import itertools
+import json
+import logging
+import os
+from pathlib import Path
+import resource
+import subprocess
+import sys
+import tempfile
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+USERNAME = "benchmark"
+APPLICATION = "MULTIMATIC"
+# Default scan interval of the integration
+SCAN_INTERVAL = timedelta(minutes=2)
+
+_values = itertools.count()
+
+
+def _serial(index: int) -> str:
+    return f"21{index:08d}"
+
+
+def _time_program(setting: dict) -> dict:
+    return {
+        day: [
+            {"startTime": "00:00", **setting},
+            {"startTime": "06:30", **setting},
+            {"startTime": "22:00", **setting},
+        ]
+        for day in (
+            "monday",
+            "tuesday",
+            "wednesday",
+            "thursday",
+            "friday",
+            "saturday",
+            "sunday",
+        )
+    }
+
+
+def _response(url: str, systems: int) -> tuple[int, object]:
+    """Get the answer of the API, values change at each call."""
+    value = next(_values) % 10
+    if url.endswith("/facilities"):
+        return 200, {
+            "body": {
+                "facilitiesList": [
+                    {
+                        "serialNumber": _serial(index),
+                        "name": f"System {index}",
+                        "firmwareVersion": "1.2.3",
+                        "networkInformation": {"macAddressEthernet": "00:00:00:00"},
+                    }
+                    for index in range(systems)
+                ]
+            }
+        }
+    if url.endswith("/gatewayType"):
+        return 200, {"body": {"gatewayType": "VR920"}}
+    if url.endswith("/hvacstate/v1/overview"):
+        return 200, {
+            "meta": {
+                "onlineStatus": {"status": "ONLINE"},
+                "firmwareUpdateStatus": {"status": "UPDATE_NOT_PENDING"},
+            },
+            "body": {"errorMessages": []},
+        }
+    if url.endswith("/systemcontrol/v1/zones"):
+        return 200, {
+            "body": [
+                {
+                    "_id": "Control_ZO1",
+                    "configuration": {
+                        "name": "Zone 1",
+                        "enabled": True,
+                        "inside_temperature": 20 + value / 10,
+                        "active_function": "HEATING",
+                    },
+                    "heating": {
+                        "configuration": {
+                            "mode": "AUTO",
+                            "setpoint_temperature": 21,
+                            "setback_temperature": 17,
+                        },
+                        "timeprogram": _time_program({"setting": "DAY"}),
+                    },
+                }
+            ]
+        }
+    if url.endswith("/systemcontrol/v1/dhw"):
+        return 200, {
+            "body": [
+                {
+                    "_id": "Control_DHW",
+                    "hotwater": {
+                        "configuration": {
+                            "operation_mode": "AUTO",
+                            "temperature_setpoint": 50,
+                        },
+                        "timeprogram": _time_program({"mode": "ON"}),
+                    },
+                    "circulation": {
+                        "configuration": {"operationMode": "AUTO"},
+                        "timeprogram": _time_program({"setting": "ON"}),
+                    },
+                }
+            ]
+        }
+    if url.endswith("/systemcontrol/v1/status"):
+        return 200, {"body": {"outside_temperature": 5 + value / 10}}
+    if url.endswith("/systemcontrol/v1/configuration/quickmode"):
+        return 200, {"body": {}}
+    if url.endswith("/systemcontrol/v1/configuration/holidaymode"):
+        return 200, {"body": {"active": False}}
+    if "/livereport/v1/devices/" in url:
+        return 200, {
+            "body": {
+                "_id": "DomesticHotWaterTankTemperature",
+                "name": "Tank temperature",
+                "value": 45 + value,
+                "unit": "°C",
+                "measurement_category": "TEMPERATURE",
+            }
+        }
+    if url.endswith("/livereport/v1"):
+        return 200, {
+            "body": {
+                "devices": [
+                    {
+                        "_id": "Control_DHW",
+                        "name": "Hot water",
+                        "reports": [
+                            {
+                                "_id": "DomesticHotWaterTankTemperature",
+                                "name": "Tank temperature",
+                                "value": 45 + value,
+                                "unit": "°C",
+                                "measurement_category": "TEMPERATURE",
+                            }
+                        ],
+                    },
+                    {
+                        "_id": "Control_SYS_MultiMatic",
+                        "name": "Control",
+                        "reports": [
+                            {
+                                "_id": "WaterPressureSensor",
+                                "name": "Water pressure",
+                                "value": 1.5 + value / 100,
+                                "unit": "bar",
+                                "measurement_category": "PRESSURE",
+                            }
+                        ],
+                    },
+                ]
+            }
+        }
+    if url.endswith("/emf/v1/devices"):
+        return 200, {
+            "body": [
+                {
+                    "id": "NoneGateway-LL_HMU00_0304_flexoTHERM_PR_EBUS",
+                    "type": "HEAT_PUMP",
+                    "marketingName": "flexoTHERM",
+                    "reports": [
+                        {
+                            "function": "CENTRAL_HEATING",
+                            "energyType": "CONSUMED_ELECTRICAL_POWER",
+                            "currentMeterReading": 1000 + value,
+                            "from": "2020-01-01",
+                            "to": "2020-01-02",
+                        }
+                    ],
+                }
+            ]
+        }
+    # No room and no ventilation
+    return 409, "Conflict"
+
+
+def _rss() -> int:
+    with open("/proc/self/statm", encoding="utf-8") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _cpu() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+async def _async_run(systems: int, cycles: int, standalone: bool) -> dict:
+    # pylint: disable=import-outside-toplevel
+    from homeassistant import bootstrap, config_entries, core
+    from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+    from homeassistant.util import dt as dt_util
+
+    import custom_components.multimatic as multimatic
+    from custom_components.multimatic.auth import AuthConnector
+    from custom_components.multimatic.const import (
+        CONF_APPLICATION,
+        CONF_FLEET,
+        CONF_SERIAL_NUMBER,
+        COORDINATORS,
+        DOMAIN,
+        PLATFORMS,
+        READY,
+        SNAPSHOT,
+    )
+    from custom_components.multimatic.utils import system_ids
+
+    # Loaded before measuring, they are used whatever the number of systems
+    for platform in PLATFORMS:
+        importlib.import_module(f"homeassistant.components.{platform}")
+        importlib.import_module(f"custom_components.multimatic.{platform}")
+
+    async def send(connector, method, url, payload):
+        # Answers take some time, as with the real API
+        await asyncio.sleep(0.05)
+        return _response(url, systems)
+
+    async def logged(connector, *args):
+        return True
+
+    # Each cycle happens one scan interval after the previous one
+    utcnow = dt_util.utcnow
+    elapsed = timedelta(0)
+
+    hass = core.HomeAssistant()
+    # Logging costs would be counted otherwise
+    logging.getLogger().setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as config_dir, patch.object(
+        AuthConnector, "_send", send
+    ), patch.object(AuthConnector, "login", logged), patch.object(
+        AuthConnector, "is_logged", logged
+    ), patch.object(
+        # All the systems are polled right away
+        multimatic,
+        "system_phase",
+        lambda serial, interval: timedelta(0),
+    ), patch.object(
+        dt_util, "utcnow", lambda: utcnow() + elapsed
+    ):
+        hass.config.config_dir = config_dir
+        hass.config.skip_pip = True
+        await bootstrap.load_registries(hass)
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        await hass.config_entries.async_initialize()
+        await hass.async_start()
+
+        gc.collect()
+        rss_before = _rss()
+
+        base = {
+            CONF_USERNAME: USERNAME,
+            CONF_PASSWORD: "password",
+            CONF_APPLICATION: APPLICATION,
+        }
+        if standalone:
+            entries = [
+                config_entries.ConfigEntry(
+                    1,
+                    DOMAIN,
+                    f"System {index}",
+                    {**base, CONF_SERIAL_NUMBER: _serial(index)},
+                    config_entries.SOURCE_USER,
+                )
+                for index in range(systems)
+            ]
+        else:
+            entries = [
+                config_entries.ConfigEntry(
+                    1,
+                    DOMAIN,
+                    "Fleet",
+                    {**base, CONF_FLEET: True},
+                    config_entries.SOURCE_USER,
+                )
+            ]
+
+        cpu_before = _cpu()
+        for entry in entries:
+            await hass.config_entries.async_add(entry)
+        ids = [
+            system_id
+            for entry in entries
+            for system_id in system_ids(hass, entry.entry_id)
+        ]
+        while not all(hass.data[DOMAIN][system_id].get(READY) for system_id in ids):
+            await asyncio.sleep(0.1)
+        await hass.async_block_till_done()
+        cpu_setup = _cpu() - cpu_before
+        entities = len(hass.states.async_all())
+
+        gc.collect()
+        rss_after = _rss()
+
+        cpu_before = _cpu()
+        for _ in range(cycles):
+            elapsed += SCAN_INTERVAL
+            if standalone:
+                # What is polled every scan interval, as the timers would do
+                refreshes = [
+                    coordinator.async_refresh()
+                    for system_id in ids
+                    for coordinator in hass.data[DOMAIN][system_id][
+                        COORDINATORS
+                    ].values()
+                    if coordinator.update_interval <= SCAN_INTERVAL
+                ]
+            else:
+                refreshes = [
+                    hass.data[DOMAIN][system_id][SNAPSHOT].async_refresh()
+                    for system_id in ids
+                ]
+            await asyncio.gather(*refreshes)
+            await hass.async_block_till_done()
+        cpu_cycles = _cpu() - cpu_before
+
+        await hass.async_stop(force=True)
+
+    return {
+        "systems": systems,
+        "entities": entities,
+        "rss_mib": rss_after / 2**20,
+        "rss_per_system_kib": (rss_after - rss_before) / systems / 2**10,
+        "setup_cpu_ms_per_system": cpu_setup * 1000 / systems,
+        "cycle_cpu_ms_per_system": cpu_cycles * 1000 / systems / cycles,
+    }
+
+
+def main() -> None:
+    """Run the benchmark for each size and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--systems", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--standalone", action="store_true")
+    parser.add_argument("--run", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        result = asyncio.run(_async_run(args.run, args.cycles, args.standalone))
+        print(json.dumps(result))
+        return
+
+    print(
+        "| systems | entities | RSS (MiB) | RSS per system (KiB) "
+        "| setup CPU per system (ms) | cycle CPU per system (ms) |"
+    )
+    print("|---|---|---|---|---|---|")
+    for systems in args.systems:
+        command = [
+            sys.executable,
+            __file__,
+            "--run",
+            str(systems),
+            "--cycles",
+            str(args.cycles),
+        ]
+        if args.standalone:
+            command.append("--standalone")
+        output = subprocess.run(
+            command, check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"| {result['systems']} | {result['entities']} | {result['rss_mib']:.0f} "
+            f"| {result['rss_per_system_kib']:.0f} "
+            f"| {result['setup_cpu_ms_per_system']:.1f} "
+            f"| {result['cycle_cpu_ms_per_system']:.1f} |"
+        )
+
+
+if __name__ == "__main__":
+    main()